@@ -1,11 +1,11 @@
+import os
 import numpy as np
-import scipy as sp
 import sys
 sys.path.insert(0, '../')
 import paths
 from cf252 import cf252_source
 from response import response_data
-import matplotlib.pyplot as plt
+from pulse_height import read_rates, fit_spectra, plot_fit
 
 
 class BSS_Calibration(object):
@@ -39,58 +39,33 @@ class BSS_Calibration(object):
         # LLD channel
         lld = 400
 
-        # initialize array
-        counts = np.zeros(len(self.sizes[1:]))
+        # the spectrum of each size, and its background where one was taken
+        filenames = [paths.main_path + '/experiment/4_17_19/cf' + str(size) + '.Spe' for size in self.sizes[1:]]
+        backgrounds = [filename.replace('.Spe', 'bg.Spe') for filename in filenames]
+        backgrounds = tuple(filename if os.path.exists(filename) else None for filename in backgrounds)
 
-        # model
-        def model(x, A, B, C, D, E):
-            """Docstring."""
-            return A * np.exp(-B * x) + C * (1 / np.sqrt(2 * np.pi * D**2)) * np.exp(-(x - E)**2 / (2 * D**2))
+        # the background subtracted, dead time corrected rates of every channel
+        rates, times = read_rates(tuple(filenames), backgrounds)
 
-        # loop through each size
-        for i, size in enumerate(self.sizes[1:]):
-
-            #
-            filename = paths.main_path + '/experiment/4_17_19/cf' + str(size) + '.Spe'
-
-            # grab the data
-            with open(filename, 'r') as F:
-                lines = F.readlines()
-
-            # extract time
-            t = int(lines[1041])
-
-            # extract channel data
-            ydata = np.array([int(l) for l in lines[12:1036]])
+        # convert back to net counts over the live time and trim up to lld
+        self.spectra = list(rates[:, lld:lld + 600] * times[:, np.newaxis])
 
-            # trim up to lld
-            ydata = ydata[lld:]
-            ydata = ydata[:600]
+        # fit every spectrum at once
+        self.fits = fit_spectra(self.spectra, p0=[1, 1, 1, 1, 300])
 
-            #
-            xdata = range(len(ydata))
+        # take the counts in the peak, convert to rate, and store
+        counts = self.fits[:, 2] / times
 
-            # fit the curve
-            popt, pcov = sp.optimize.curve_fit(model, xdata, ydata, p0=[1, 1, 1, 1, 300])
-
-            # sum counts beyond lld, convert to rate, and store
-            counts[i] = popt[2] / t
+        return counts
 
-            # plot fit
-            fig = plt.figure(i + 300)
-            ax = fig.add_subplot(111)
-            ax.set_xlabel('Channel')
-            ax.set_ylabel('Counts')
-            ax.plot(xdata, ydata, color='navy', ls='None', marker='.', markersize=0.3, label='Data')
-            ax.plot(xdata, model(xdata, *popt), color='seagreen', label='Model')
-            ax.legend()
-            fig.savefig('plot/bs{}_calibration_spectrum.png'.format(i + 1), dpi=300)
-            fig.clear()
+    def plot_spectra(self):
+        """Plots each of the spectra against its fit."""
 
-            # sum counts beyond lld, convert to rate, and store
-            counts[i] = popt[2] / t
+        # loop through each size
+        for i, (ydata, popt) in enumerate(zip(self.spectra, self.fits)):
+            plot_fit(ydata, popt, 'plot/bs{}_calibration_spectrum.png'.format(i + 1), i + 300)
 
-        return counts
+        return
 
     def calc_responses(self):
         """Docstring."""
@@ -101,15 +76,11 @@ class BSS_Calibration(object):
         # get response functions
         responses = response_data()
 
-        # this pulls only the rfs for the bonner spheres
-        response_functions = []
-        for name, response in responses.items():
-            if 'pbs' in name:
-                response_functions.append(response.int)
-        response_functions = np.array(response_functions)
+        # this pulls only the rfs for the point bonner spheres
+        point_spheres = responses.query('pbs')
 
         # fold the rfs and the flux together, convert to uCi / atom
-        self.responses = np.sum(response_functions * flux[1:], axis=1)
+        self.responses = point_spheres.fold(flux[1:])[0]
 
         return
 
@@ -1,11 +1,10 @@
 import numpy as np
-import scipy as sp
-import matplotlib.pyplot as plt
 import sys
 sys.path.insert(0, '../')
 import paths
 from nebp_flux import extract_mcnp
 from response import response_data
+from pulse_height import read_rates, fit_spectra, plot_fit
 from bss_calibration import BSS_Calibration
 from theoretical_activities import Au_Foil_Theoretical
 from process_activities import Au_Foil_Data
@@ -42,61 +41,41 @@ class BSS_Data(object):
 
     def process_experiment(self):
         """Implement after experiment."""
+
         # LLD channel
         lld = 400
 
-        # initialize array
-        counts = np.zeros(len(self.sizes))
-
-        # model
-        def model(x, A, B, C, D, E):
-            """Docstring."""
-            return A * np.exp(-B * x) + C * (1 / np.sqrt(2 * np.pi * D**2)) * np.exp(-(x - E)**2 / (2 * D**2))
-
-        # loop through each size
-        for i, size in enumerate(self.sizes):
-
-            #
-            filename = paths.main_path + '/experiment/4_18_19/bss' + str(size) + '.Spe'
-
-            # grab the data
-            with open(filename, 'r') as F:
-                lines = F.readlines()
-
-            # extract time
-            t = int(lines[2065])
+        # the spectrum of each size, none of which have their own background
+        filenames = tuple(paths.main_path + '/experiment/4_18_19/bss' + str(size) + '.Spe' for size in self.sizes)
+        backgrounds = (None,) * len(filenames)
 
-            # extract channel data
-            ydata = np.array([int(l) for l in lines[12:2059]])
+        # the rates of every channel, corrected for dead time by the live
+        # clock of each detector
+        rates, times = read_rates(filenames, backgrounds)
 
-            # trim up to lld
-            ydata = ydata[lld:1900]
+        # convert back to counts over the live time and trim up to lld
+        self.spectra = list(rates[:, lld:1900] * times[:, np.newaxis])
 
-            #
-            xdata = range(len(ydata))
+        # fit every spectrum at once
+        self.fits = fit_spectra(self.spectra, p0=[1, 1, 1, 1, 1000])
 
-            # fit the curve
-            popt, pcov = sp.optimize.curve_fit(model, xdata, ydata, p0=[1, 1, 1, 1, 1000])
-
-            # sum counts beyond lld, convert to rate, and store
-            counts[i] = popt[2] / t
-
-            # plot fit
-            fig = plt.figure(i + 200)
-            ax = fig.add_subplot(111)
-            ax.set_xlabel('Channel')
-            ax.set_ylabel('Counts')
-            ax.plot(xdata, ydata, color='navy', ls='None', marker='.', markersize=0.3, label='Data')
-            ax.plot(xdata, model(xdata, *popt), color='seagreen', label='Model')
-            ax.legend()
-            fig.savefig('plot/bs{}_spectrum.png'.format(i), dpi=300)
-            fig.clear()
+        # take the counts in the peak, convert to rate, and store
+        counts = self.fits[:, 2] / times
 
         # correct for calibration efficiency
         counts /= self.calibration.efficiency
 
         return counts
 
+    def plot_spectra(self):
+        """Plots each of the spectra against its fit."""
+
+        # loop through each size
+        for i, (ydata, popt) in enumerate(zip(self.spectra, self.fits)):
+            plot_fit(ydata, popt, 'plot/bs{}_spectrum.png'.format(i), i + 200)
+
+        return
+
     def calc_responses(self):
         """Docstring."""
 
@@ -110,14 +89,10 @@ class BSS_Data(object):
         responses = response_data()
 
         # this pulls only the rfs for the bonner spheres
-        response_functions = []
-        for name, response in responses.items():
-            if 'bs' in name and 'p' not in name:
-                response_functions.append(response.int)
-        response_functions = np.array(response_functions)
+        spheres = responses.query('bs')
 
         # fold the rfs and the flux together, convert to uCi / atom
-        self.responses = np.sum(response_functions * flux, axis=1)
+        self.responses = spheres.fold(flux)[0]
 
         return
 
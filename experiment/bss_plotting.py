@@ -9,6 +9,9 @@ def plot_calibration():
     # pull in calibration data
     data = BSS_Calibration()
 
+    # the fit of each spectrum
+    data.plot_spectra()
+
     # response comparison -----------------------------------------------------
     # set up plotting environment
     fig = plt.figure(100)
@@ -67,6 +70,9 @@ def plot_experiment():
     # pull in calibration data
     data = BSS_Data()
 
+    # the fit of each spectrum
+    data.plot_spectra()
+
     # response comparison -----------------------------------------------------
     # set up plotting environment
     fig = plt.figure(103)
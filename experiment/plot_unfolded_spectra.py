@@ -2,7 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.pyplot import cm
 from unfold_nebp import Unfold_NEBP
-from spectrum import Spectrum
+from spectrum import Spectrum, step_coordinates
 
 
 def plot_unfolded_spectra():
@@ -45,13 +45,13 @@ def plot_unfolded_spectra():
     # create some colors
     colors = cm.magma(np.linspace(0, 1, len(unfolded_data.evolution)))[::-1]
 
-    for i, iteration in enumerate(unfolded_data.evolution):
+    # convert every iteration to differential form, sharing the edges
+    evolution = np.array(unfolded_data.evolution) / np.diff(unfolded_data.eb)
+    X, Y = step_coordinates(unfolded_data.eb, evolution)
 
-        # convert to spectrum object
-        unfolded_spectrum = Spectrum(unfolded_data.eb, iteration, 0)
-
-        # plot the data
-        ax.plot(*unfolded_spectrum.plot('plot', 'diff'), color=colors[i], lw=0.5)
+    # plot the data, all iterations at once
+    ax.set_prop_cycle(color=colors)
+    ax.plot(X, Y.T, lw=0.5)
 
     # save it
     fig.savefig('plot/nebp_gravel_evolution.png', dpi=300)
@@ -1,11 +1,11 @@
 import numpy as np
-import re
 import sys
 sys.path.insert(0, '../')
 import paths
+from strip_chart import read_strip_chart
+from genie import read_campaign
+from activation import activation
 from scipy.constants import N_A
-from scipy.integrate import odeint
-from scipy.interpolate import interp1d
 
 
 class Au_Foil_Data(object):
@@ -67,78 +67,23 @@ class Au_Foil_Data(object):
 
         return
 
-    def convert_time(self, date, time, am_pm):
-        """A useful utility for taking date time info in dd/mm/yy hh:mm:ss
-        AM/PM and converting into seconds. In this function, it is assumed that
-        the month and year remain constant and that everything is shifted back
-        5 days, so the 5th is day zero."""
-
-        # parse out the day
-        d = float(date.split('/')[1])
-
-        # parse out the times
-        h, m, s = [float(t) for t in time.split(':')]
-
-        # add 12 hours if pm
-        pm_extra = 0 if am_pm is 'AM' else 12
-
-        # return the absolute time in seconds
-        return (d - 5) * 86400 + (h + pm_extra) * 3600 + m * 60 + s
-
     def extract_RPT_data(self):
         """A utility to read the .RPT files from the Genie2K software and
         extract the irradiation times and measured activities."""
 
-        # a data structure to store the irradiation information
-        # 5 is the number of values to be extracted from each file
-        foil_activities = np.zeros((len(self.foil_ids), 5))
-
-        # grab info for each foil
-        for i, foil_id in enumerate(self.foil_ids):
-
-            # create filename
-            filename = paths.main_path + '/experiment/4_5_19/au' + foil_id + '.RPT'
-
-            # read the file
-            with open(filename, 'r') as F:
-                output = F.read()
-
-            # grab the activity and error data
-            pattern = re.compile(r'AU-198     \d.\d\d\d      \d.\d\d\d\d\d\dE[+-]\d\d\d   \d.\d\d\d\d\d\dE[+-]\d\d\d')
-            results = re.findall(pattern, output)
-
-            # convert those values to floats and store
-            act, err = [float(r) for r in results[-1].split()[2:]]
-
-            # pull the detector live times
-            pattern = re.compile(r'Live Time                       :\s+\d+.\d seconds')
-            results = re.findall(pattern, output)
-
-            # convert live times to floats
-            live_time = float(results[0].split()[-2])
-
-            # pull the detector real times
-            pattern = re.compile(r'Real Time                       :\s+\d+.\d seconds')
-            results = re.findall(pattern, output)
+        # read every count of the campaign
+        records = read_campaign(paths.main_path + '/experiment/4_5_19', 'AU-198')
 
-            # convert live times to floats
-            real_time = float(results[0].split()[-2])
+        # pull out the foils used, in order
+        names = list(records['name'])
+        records = records[[names.index('au' + foil_id) for foil_id in self.foil_ids]]
 
-            # pull the counting times
-            pattern = re.compile(r'Acquisition Started             : \d/\d?\d/\d\d\d\d\s+\d?\d:\d\d:\d\d [AP]M')
-            results = re.findall(pattern, output)
+        # the measured activities and detector live and real times
+        self.a_c, self.a_c_error = records['activity'], records['activity_error']
+        self.live, self.real = records['live'], records['real']
 
-            # split data into format accepted by self.convert_time
-            t_c = results[0].split()[-3:]
-
-            # convert times to absolute
-            t_c = self.convert_time(*t_c)
-
-            # store data in structure
-            foil_activities[i] = act, err, live_time, real_time, t_c
-
-        # unpack the columns into arrays stored by the object
-        self.a_c, self.a_c_error, self.live, self.real, self.t_c = foil_activities.T
+        # the counting times in seconds, with the 5th as day zero
+        self.t_c = (records['start'] - np.datetime64('2019-04-05')) / np.timedelta64(1, 's')
 
         return
 
@@ -147,37 +92,16 @@ class Au_Foil_Data(object):
         times and powers over which the irradiation occurred, then scales
         those values by the nominal power."""
 
-        # read the file, slicing off the last 2000 lines, as they are unneeded
-        with open(paths.main_path + '/experiment/4_5_19/5APR2019.txt', 'r') as F:
-            lines = F.readlines()[:-2000]
-
-        # create structures to house the data
-        self.times = np.empty(len(lines))
-        self.powers = np.empty(len(lines))
-
-        # loop through each line of data
-        for i, line in enumerate(lines):
-
-            # due the the format of the data, it's best to split at commas
-            # and semicolons
-            line = re.split('[,;]', line)
-
-            # convert the times to absolute
-            self.times[i] = self.convert_time(*line[:2], 'AM')
+        # read the columns of the file, slicing off the last 2000 lines, as
+        # they are unneeded, with the zeros in the data filled forward
+        data = read_strip_chart(paths.main_path + '/experiment/4_5_19/5APR2019.txt')[:-2000]
 
-            # power is in column 6 in units of percent of MW(th), so
-            # convert power from percent of a MW(th) to W(th)
-            self.powers[i] = float(line[9]) * 0.01 * 1E6
+        # convert the times to absolute, with the 5th as day zero
+        self.times = data[:, 0] - 5 * 86400
 
-        # data contains some random zeros, so let's fix that
-        for i, power in enumerate(self.powers):
-
-            # basically, if the power is a zero
-            if not power:
-
-                # set the power equal to the previous value in the array
-                # this assumes the power doesn't deviate so much over a second
-                self.powers[i] = self.powers[i - 1]
+        # power is the third channel in units of percent of MW(th), so
+        # convert power from percent of a MW(th) to W(th)
+        self.powers = data[:, 3] * 0.01 * 1E6
 
         # store the power profile by dividing by the nominal power
         self.power_profile = self.powers / self.P
@@ -211,25 +135,13 @@ class Au_Foil_Data(object):
     def calc_a_sat(self):
         """This utility backs out the saturation activities for each foil."""
 
-        # we need an array of times that at least spans the entire time domain
-        full_times = np.arange(0, self.t_c[-1] + 100)
-
-        # convert the power profile to a callable function
-        P = interp1d(self.times, self.power_profile, bounds_error=False, fill_value=0)
-
-        # the differential form of the isotope production/decay balance
-        def N_prime(N, t):
-            return P(t) - self.decay_constant * N
-
-        # solve the differential equation over the time domain
-        N_t = odeint(N_prime, y0=0, t=full_times)[:, 0]
-
-        # convert the number of atoms to activities
-        self.activity_profile = N_t * self.decay_constant
+        # the atoms present at each counting time, from the power profile
+        N_t = activation(self.times, self.power_profile, self.decay_constant, self.t_c)
 
-        # divide each foil by the saturation ratio, which is the ratio of the
-        # counting activity to the saturation activity
-        self.a_sat = np.array([self.a_c[i] / self.activity_profile[int(self.t_c[i])] for i in range(self.n)])
+        # the saturation ratio is the ratio of the counting activity to the
+        # saturation activity, so divide each foil by it
+        self.saturation_ratio = N_t * self.decay_constant
+        self.a_sat = self.a_c / self.saturation_ratio
 
         return
 
@@ -41,14 +41,10 @@ class Au_Foil_Theoretical(object):
         responses = response_data()
 
         # this pulls only the rfs for the gold foil tube
-        response_functions = []
-        for name, response in responses.items():
-            if 'au' in name:
-                response_functions.append(response.int)
-        response_functions = np.array(response_functions)
+        gold = responses.query('ft', 'au')
 
         # fold the rfs and the flux together, convert to uCi / atom
-        a_sat_atom = np.sum(response_functions * flux, axis=1) * (1 / 3.7E4)
+        a_sat_atom = gold.fold(flux)[0] * (1 / 3.7E4)
 
         # only care about the ones that match the experiment
         self.a_sat_atom = a_sat_atom[:self.experiment.n]
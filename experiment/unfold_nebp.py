@@ -5,7 +5,7 @@ import paths
 from nebp_flux import extract_mcnp
 from response import response_data
 from process_activities import Au_Foil_Data
-from origami import unfold
+from origami import unfold, unfold_uncertainty
 
 
 class Unfold_NEBP(object):
@@ -28,10 +28,13 @@ class Unfold_NEBP(object):
         self.ds = self.prepare_default_spectrum()
 
         # prep response matrix
-        self.R, self.eb = self.prepare_response_matrix()
+        self.R, self.R_error, self.eb = self.prepare_response_matrix()
 
-        # get responses
+        # get responses, with an assumed 5% standard deviation, whose square
+        # is the variance that weights the unfolding
         self.N = self.prepare_responses()
+        self.N_error = self.N * 0.05
+        self.sigma2 = self.N_error ** 2
 
         # unfold
         self.sol_gravel, self.evolution, self.sol_maxed = self.unfold()
@@ -55,18 +58,10 @@ class Unfold_NEBP(object):
         # get response functions
         responses = response_data()
 
-        # this pulls only the rfs for the bonner spheres
-        response_functions = []
-        for name, response in responses.items():
-            if 'au' in name:
-                response_functions.append(response.int)
-                eb = response.edges
-        response_functions = np.array(response_functions)
+        # this pulls only the rfs for the gold foils used
+        gold = responses.query('ft', 'au', 0, self.num_foils - 1)
 
-        #
-        response_functions = response_functions[:self.num_foils]
-
-        return response_functions, eb
+        return gold.int, gold.int_error, gold.edges
 
     def prepare_responses(self):
         """Docstring."""
@@ -83,10 +78,25 @@ class Unfold_NEBP(object):
         """Docstring."""
 
         # unfold
-        grv_solution, evolution = unfold(self.N, self.N * 0.05, self.R, self.ds, method='Gravel', params=self.params)
-        max_solution = unfold(self.N, self.N * 0.05, self.R, self.ds, method='MAXED', params=self.params)
+        grv_solution, evolution = unfold(self.N, self.sigma2, self.R, self.ds, method='Gravel', params=self.params)
+        max_solution = unfold(self.N, self.sigma2, self.R, self.ds, method='MAXED', params=self.params)
 
         return grv_solution, evolution, max_solution
 
+    def sample_uncertainty(self, samples=1000, method='Gravel', seed=None, processes=None):
+        """Propagates the response and response function errors through the
+        unfolding by sampling, storing the mean, standard deviation and
+        covariance of the unfolded spectrum."""
+
+        # unfold the perturbed samples across a process pool
+        results = unfold_uncertainty(self.N, self.sigma2, self.R, self.ds, self.N_error, self.R_error,
+                                     samples=samples, method=method, params=self.params, seed=seed,
+                                     processes=processes)
+
+        # store the statistics
+        self.sol_mean, self.sol_std, self.sol_cov = results
+
+        return results
+
 if __name__ == '__main__':
     unfolded_nebp = Unfold_NEBP()
@@ -1,7 +1,6 @@
 import numpy as np
-import scipy as sp
-from scipy.constants import N_A
 import sys
+from functools import lru_cache
 sys.path.insert(0, '../')
 import paths
 from group_structures import energy_groups
@@ -17,8 +16,49 @@ def watt_distribution(e, a, b):
     return C * np.exp(-a * e) * np.sinh(np.sqrt(b * e))
 
 
+def watt_integrals(eb, a, b, order=16):
+    """Integrates the watt distribution over every group of the bin edges
+    at once. A gauss-legendre rule of the given order is applied in sqrt(e),
+    where the distribution is smooth, which is exact to round off for both
+    the wide high energy groups and the narrow thermal ones."""
+
+    # quadrature nodes and weights on [-1, 1]
+    nodes, weights = np.polynomial.legendre.leggauss(order)
+
+    # map the nodes onto each group in sqrt(e)
+    low, high = np.sqrt(eb[:-1]), np.sqrt(eb[1:])
+    half_width = 0.5 * (high - low)
+    u = half_width[:, np.newaxis] * nodes + (0.5 * (high + low))[:, np.newaxis]
+
+    # de = 2 u du
+    return half_width * np.dot(2 * u * watt_distribution(u ** 2, a, b), weights)
+
+
+@lru_cache(maxsize=16)
+def watt_groups(structure, a, b):
+    """Discretizes the watt distribution into the groups of an energy
+    structure, normalized to one over the structure. The first entry is zero,
+    matching the other fluxes on bin edges."""
+
+    # read in bin structure
+    eb = energy_groups(structure)
+
+    # integrate every group at once
+    data = np.zeros(len(eb))
+    data[1:] = watt_integrals(eb, a, b)
+
+    # make sure scaled to one
+    data = data / np.sum(data)
+
+    # the cached data is shared, so protect it
+    data.setflags(write=False)
+
+    return data
+
+
 def cf252_source():
     """Docstring."""
+    from scipy.constants import N_A
 
     # californium data
     nu_bar = 3.757
@@ -50,22 +90,10 @@ def cf252_source():
     # decay to present day
     activity = A0 * np.exp(-decay_constant * t)
 
-    # read in bin structure
-    eb = energy_groups('scale252')
-
     # discretize the spectrum
-    data = np.zeros(len(eb))
-
-    #
-    for i in range(len(eb[1:])):
-
-        #
-        data[i + 1] = sp.integrate.quad(watt_distribution, eb[i], eb[i + 1], args=(a, b))[0]
-
-    # make sure scaled to one
-    data = data / np.sum(data)
+    data = watt_groups('scale252', a, b)
 
     # scale by number of neutrons per fisison and by activity
-    data *= nu_bar * activity
+    data = data * (nu_bar * activity)
 
     return data
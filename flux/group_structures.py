@@ -1,9 +1,15 @@
 import numpy as np
 
+# energy group structures that have already been built, by name
+energy_group_registry = {}
+
 
 def energy_groups(structure='wims69'):
     """ Returns energy group bounds in increasing order.
 
+    Each structure is built the first time it is requested and the same
+    read-only array is returned on every later call.
+
     Parameters
     ----------
     structure : str
@@ -11,6 +17,25 @@ def energy_groups(structure='wims69'):
         phoenix25, shem281, hr6, and hr16.
     """
 
+    if structure not in energy_group_registry:
+
+        # build the bounds and protect the shared copy
+        eb = np.ascontiguousarray(build_energy_groups(structure))
+        eb.setflags(write=False)
+        energy_group_registry[structure] = eb
+
+    return energy_group_registry[structure]
+
+
+def build_energy_groups(structure):
+    """ Builds energy group bounds in increasing order.
+
+    Parameters
+    ----------
+    structure : str
+        Named structure, as in energy_groups.
+    """
+
     if structure == 'wims69':
         """ WIMS 69-group structure.
 
@@ -1,23 +1,22 @@
-import re
-import numpy as np
+import os
+from functools import lru_cache
 import sys
 sys.path.insert(0, '../')
 import paths
+from mcnp_output import open_output, read_table, flux_pattern
 
 
-def extract_mcnp(par, power):
-    """Utility that grabs the flux data from an mcnp output file."""
+@lru_cache(maxsize=8)
+def read_flux(filename, size, mtime):
+    """Reads the unscaled flux tally data from an mcnp output file. The size
+    and modification time of the file are only used to key the cache, so
+    that each version of the file is parsed once per process."""
 
     # open file w/ neutron data
-    with open(paths.main_path + '/flux/mcnp/ksuna.out') as F:
-        mcnp_file = F.read()
-
-    # grab all tally data
-    pattern = re.compile(r'    \d.\d\d\d\dE[+-]\d\d   \d.\d\d\d\d\dE[+-]\d\d \d.\d\d\d\d')
-    results = re.findall(pattern, mcnp_file)
+    with open_output(filename) as mm:
 
-    # convert to np array
-    results = np.array([[float(r.split()[1]), float(r.split()[2])] for r in results])
+        # grab all tally data straight into an array
+        results = read_table(mm, flux_pattern)
 
     # convert error to absolute
     results[:, 1] = results[:, 0] * results[:, 1]
@@ -25,12 +24,25 @@ def extract_mcnp(par, power):
     # reshape to fit data structure
     results = results.reshape(8, -1, 253, 2)
 
+    # the cached data is shared, so protect it
+    results.setflags(write=False)
+
+    return results
+
+
+def extract_mcnp(par, power):
+    """Utility that grabs the flux data from an mcnp output file."""
+
+    # grab the raw data, parsed only the first time this file is seen
+    filename = paths.main_path + '/flux/mcnp/ksuna.out'
+    stat = os.stat(filename)
+    results = read_flux(filename, stat.st_size, stat.st_mtime_ns)
+
     # the following values were manually pulled from the file used above
     k_eff = 1.09946
     nu_bar = 2.438
 
     # scale
     scaling_constant = (nu_bar * power) / (200 * 1.60218e-13 * k_eff)
-    results *= scaling_constant
 
-    return results
+    return results * scaling_constant
@@ -0,0 +1,34 @@
+import numpy as np
+from scipy.integrate import quad
+from group_structures import energy_groups
+from cf252 import watt_distribution, watt_integrals, watt_groups
+
+
+def test_watt_integrals():
+    """Compares groups of the scale252 structure to adaptive quadrature,
+    including the narrowest thermal group and the top group."""
+
+    # load test values
+    a, b = 0.847458, 1.03419
+    eb = energy_groups('scale252')
+    integrals = watt_integrals(eb, a, b)
+
+    # the first group, a thermal one, a mid group and the top group
+    for i in (0, 20, 150, len(eb) - 2):
+        expected = quad(watt_distribution, eb[i], eb[i + 1], args=(a, b), epsabs=0, epsrel=1E-13)[0]
+        assert np.isclose(integrals[i], expected, rtol=1E-12, atol=0)
+
+    return
+
+
+def test_watt_groups():
+    """The discretized spectrum is normalized and cached read only."""
+
+    # load test values
+    data = watt_groups('scale252', 0.847458, 1.03419)
+
+    assert data[0] == 0 and np.isclose(np.sum(data), 1)
+    assert not data.flags.writeable
+    assert watt_groups('scale252', 0.847458, 1.03419) is data
+
+    return
@@ -1,6 +1,7 @@
+import os
 import sys
-# absolute path to main repo path
-main_path = '/home/john/workspace/nebp'
+# absolute path to main repo path, wherever the repo is checked out
+main_path = os.path.dirname(os.path.abspath(__file__))
 
 sys.path.insert(0, main_path + '/flux')
 sys.path.insert(0, main_path + '/response')
@@ -1,14 +1,14 @@
 import numpy as np
 from response import response_data
-from spectrum import Spectrum
-import matplotlib.pyplot as plt
 
 
-def collapse_rfs(edge_indices):
+def collapse_rfs(edge_indices, family=None, material=''):
     """Docstring"""
 
-    # get response functions
+    # get response functions, optionally only those of one detector family
     responses = response_data()
+    if family is not None:
+        responses = responses.query(family, material)
 
     # check edge_indices are a list
     assert type(edge_indices) is list
@@ -19,52 +19,19 @@ def collapse_rfs(edge_indices):
     # check that the indices are in the rfs
     pass
 
-    # add a zero to the front of the edge_indices
-    edge_indices.insert(0, 0)
+    # add a zero to the front of the edge_indices, without changing the input
+    edge_indices = [0] + edge_indices
 
-    # loop through rfs
-    for name, response in responses.items():
-
-        # pull out the data
-        edges, values, error = response.edges, response.int, response.int_error
-
-        # create new structures for the values and errors
-        new_edges = np.zeros(len(edge_indices))
-        new_values, new_error = [np.zeros(len(edge_indices) - 1) for _ in range(2)]
-
-        # calculate the weights of each bin
-        weights = response.widths
-
-        # sum over the bounds with the weighting
-        for i in range(len(edge_indices) - 1):
-
-            # put the edge in the new edges
-            new_edges[i] = edges[edge_indices[i]]
-
-            # find the fraction of the total response that makes up the bin
-            total_fraction = np.sum(weights[edge_indices[i]:edge_indices[i + 1] + 1])
-
-            # calculate the weighted average and store
-            new_values[i] = np.sum(values[edge_indices[i]:edge_indices[i + 1] + 1] * weights[edge_indices[i]:edge_indices[i + 1] + 1]) / total_fraction
-
-            # root sum squared of the errors
-            new_error[i] = np.sqrt(np.sum((error[edge_indices[i]:edge_indices[i + 1] + 1] * weights[edge_indices[i]:edge_indices[i + 1] + 1])**2)) / total_fraction
-
-        # add the final edge (missed by the looping)
-        new_edges[-1] = edges[edge_indices[-1]]
-
-        # store the collapsed data
-        responses[name] = Spectrum(new_edges, new_values, new_error, form='int')
-
-    # return the data
-    return responses
+    # collapse every response at once
+    return responses.collapse(edge_indices)
 
 
 def plot_collapsed_rfs(edge_indices):
     """Docstring"""
+    import matplotlib.pyplot as plt
 
     # get the data
-    responses = collapse_rfs(edge_indices)
+    responses = collapse_rfs(edge_indices, 'ft', 'au')
 
     # plot response functions -------------------------------------------------
     fig = plt.figure(0, figsize=(10, 6))
@@ -83,9 +50,6 @@ def plot_collapsed_rfs(edge_indices):
         # parse out name and response
         name, response = item
 
-        if 'ft_au' not in name:
-            continue
-
         # plot the integral response
         ax.plot(*response.plot('plot', 'int'), label=name, color=color[i], lw=0.5)
         ax.errorbar(*response.plot('errorbar', 'int'), color=color[i], ls='None', lw=0.5)
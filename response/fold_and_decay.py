@@ -20,14 +20,10 @@ def fold_and_decay():
     responses = response_data()
 
     # this pulls only the rfs for the gold foil tube
-    response_functions = []
-    for name, response in responses.items():
-        if 'au' in name:
-            response_functions.append(response.int)
-    response_functions = np.array(response_functions)
+    gold = responses.query('ft', 'au')
 
     # gold the rfs and the flux together, convert to uCi/g
-    sat_act_mass = np.sum(response_functions * flux, axis=1) * (1 / 3.7E4)
+    sat_act_mass = gold.fold(flux)[0] * (1 / 3.7E4)
 
     # multiply by mass to get in uCi
     sat_act = sat_act_mass * 37
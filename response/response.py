@@ -1,15 +1,109 @@
-import re
 import numpy as np
-from scipy.constants import N_A
-import matplotlib.pyplot as plt
 import sys
 sys.path.insert(0, '../')
 import paths
-from spectrum import Spectrum
+from spectrum import Spectrum, SpectrumStack
+from parse_cache import cached_parse, parse_files
+from mcnp_output import open_output, tally_sections, tally_number, read_rows, tally_pattern, pbs_tally_pattern
 from group_structures import energy_groups, cosine_groups, radial_groups
 from nebp_flux import extract_mcnp
 
 
+def parse_tallies(filename):
+    """Reads the tallies of a response mcnp output file into an array of
+    tally numbers and an array of values and absolute errors for each."""
+
+    with open_output(filename) as mm:
+
+        # the last three sections aren't responses
+        sections = tally_sections(mm)[:-3]
+
+        # create structures to house the data
+        numbers = np.zeros(len(sections), dtype=int)
+        data = np.zeros((len(sections), 252, 2))
+
+        # loop through each tally section
+        for i, (start, end) in enumerate(sections):
+
+            # grab tally number
+            numbers[i] = tally_number(mm, start)
+
+            # read the values and errors straight into the array
+            read_rows(mm, tally_pattern, data[i], start, end)
+
+    # convert error to absolute
+    data[:, :, 1] *= data[:, :, 0]
+
+    return {'numbers': numbers, 'data': data}
+
+
+def parse_pbs_tally(filename):
+    """Reads the tally of a point bonner sphere mcnp output file into an
+    array of values and absolute errors."""
+
+    data = np.zeros((252, 2))
+
+    # read the values and errors straight into the array, skipping the total
+    with open_output(filename) as mm:
+        read_rows(mm, pbs_tally_pattern, data, skip=1)
+
+    # convert error to absolute
+    data[:, 1] *= data[:, 0]
+
+    return {'data': data}
+
+
+class ResponseLibrary(SpectrumStack):
+
+    """A stack of response functions that also holds the metadata of each
+    response, indexed so that detector families can be queried without
+    scanning the names."""
+
+    # the metadata of each response; the sphere size is nan for the foils, the
+    # foil position is -1 for the spheres, and the tally is -1 for the point
+    # spheres, whose outputs are not split by tally
+    metadata_dtype = [('family', 'U3'), ('material', 'U2'), ('size', float), ('position', int), ('tally', int)]
+
+    def __init__(self, edges, names, values, error, metadata):
+        """Create the library from the stacked responses and a (family,
+        material, size, position, tally) tuple for each, where the family is
+        literal in ('ft', 'bs', 'pbs') and the material is empty for the
+        spheres."""
+
+        # store the stack
+        SpectrumStack.__init__(self, edges, names, values, error)
+
+        # store the metadata
+        self.metadata = np.array(metadata, dtype=self.metadata_dtype)
+
+        # foils are located by position and spheres by size
+        family, material = self.metadata['family'], self.metadata['material']
+        location = np.where(family == 'ft', self.metadata['position'], self.metadata['size'])
+
+        # index the rows of each family, sorted by location
+        self.indexes = {}
+        for key in set(zip(family.tolist(), material.tolist())):
+            rows = np.flatnonzero((family == key[0]) & (material == key[1]))
+            rows = rows[np.argsort(location[rows], kind='stable')]
+            self.indexes[key] = (location[rows], rows)
+
+        return
+
+    def query(self, family, material='', low=-np.inf, high=np.inf):
+        """Returns a stack of the responses of a detector family, literal in
+        ('ft', 'bs', 'pbs'), and material for the foil tube, whose foil
+        position or sphere size lies between low and high, inclusive."""
+
+        # pull the index of the family
+        locations, rows = self.indexes[(family, material)]
+
+        # the locations are sorted, so the bounds are found by bisection
+        start = np.searchsorted(locations, low, side='left')
+        stop = np.searchsorted(locations, high, side='right')
+
+        return self.take(rows[start:stop])
+
+
 def grab_tally(name, scaling_factor):
     """Produces a dictionary of all of the tally data from one of the
     responses used in the analysis."""
@@ -30,48 +124,29 @@ def grab_tally(name, scaling_factor):
     #
     tally = {}
 
-    for i in range(len(tally_regions) - 1):
-
-        # name
-        filename = name + '{}.out'.format(i)
+    # names
+    filenames = [paths.main_path + '/response/mcnp/' + name + '{}.out'.format(i) for i in range(len(tally_regions) - 1)]
 
-        # open the file
-        with open(paths.main_path + '/response/mcnp/' + filename) as F:
-            output = F.read()
-
-        tallies_txt = output.split('1tally')[1:-3]
+    # read the parsed tallies of every region at once
+    for i, parsed in enumerate(parse_files(filenames, parse_tallies)):
 
         # loop through each tally section
-        for tally_txt in tallies_txt:
+        for number, data in zip(parsed['numbers'], parsed['data']):
 
-            # grab tally number
-            tally_number = int(tally_txt.split()[0])
+            # convert from a numpy integer
+            number = int(number)
 
-            if tally_number not in tally:
+            if number not in tally:
                 # create dict space
-                tally[tally_number] = np.zeros((253, 2))
-
-            # use regular expression to grab all data
-            pattern = re.compile(r'\d.\d\d\d\d\dE[+-]\d\d \d.\d\d\d\d')
-            results = re.findall(pattern, tally_txt)[:252]
+                tally[number] = np.zeros((253, 2))
 
-            for j, result in enumerate(results):
-
-                result = result.split()
-                val, err = float(result[0]), float(result[0]) * float(result[1])
-
-                #
-                val = val * regional_pdf[i] * scaling_factor
-                err = (err * regional_pdf[i] * scaling_factor)**2
-
-                tally[tally_number][j + 1] += np.array([val, err])
+            # weight by the region, summing errors in quadrature
+            tally[number][1:, 0] += data[:, 0] * regional_pdf[i] * scaling_factor
+            tally[number][1:, 1] += (data[:, 1] * regional_pdf[i] * scaling_factor)**2
 
     # loop through each tally section
-    for tally_txt in tallies_txt:
-
-        # grab tally number
-        tally_number = int(tally_txt.split()[0])
-        tally[tally_number][:, 1] = np.sqrt(tally[tally_number][:, 1])
+    for number in tally:
+        tally[number][:, 1] = np.sqrt(tally[number][:, 1])
 
     return tally
 
@@ -85,41 +160,35 @@ def grab_pbs_tally(name, scaling_factor):
     # name
     filename = name + '.out'
 
-    # open the file
-    with open(paths.main_path + '/response/mcnp/' + filename) as F:
-        output = F.read()
-
-    #
-    #output = output.split('1tally')[1]
+    # read the parsed tally of the file
+    parsed = cached_parse(paths.main_path + '/response/mcnp/' + filename, parse_pbs_tally)
 
     tally[name] = np.zeros((253, 2))
-
-    # use regular expression to grab all data
-    pattern = re.compile(r'                 \d.\d\d\d\d\dE[+-]\d\d \d.\d\d\d\d')
-    results = re.findall(pattern, output)[1:253]
-
-    for j, result in enumerate(results):
-
-        result = result.split()
-        val, err = float(result[0]), float(result[0]) * float(result[1])
-
-        val = val * scaling_factor
-        err = err * scaling_factor
-
-        tally[name][j + 1] += np.array([val, err])
+    tally[name][1:] = parsed['data'] * scaling_factor
 
     return tally
 
 
 def response_data():
-    """This function consolidates ALL of the response data in this repo."""
+    """This function consolidates ALL of the response data in this repo into
+    a response library, in the order they are added below."""
+    from scipy.constants import N_A
 
-    # create a dict that will house all of the data
+    # create a dict that will house all of the data, and the metadata of each
     response_data = {}
+    metadata = []
 
     # get energy groups
     erg_struct = energy_groups('scale252')
 
+    # parse every output file up front, so cold caches are rebuilt in parallel
+    mcnp_path = paths.main_path + '/response/mcnp/'
+    sizes = [0, 2, 3, 5, 8, 10, 12]
+    names = ['ft_au', 'ft_in'] + ['bs{}_'.format(size) for size in sizes]
+    regions = range(len(radial_groups('nebp')) - 1)
+    parse_files([mcnp_path + name + '{}.out'.format(i) for name in names for i in regions], parse_tallies)
+    parse_files([mcnp_path + 'pbs{}.out'.format(size) for size in sizes], parse_pbs_tally)
+
     # the gold foil tube ------------------------------------------------------
     scaling_factor = 1E-24 * 252
     gold_tallys = grab_tally('ft_au', scaling_factor)
@@ -131,9 +200,11 @@ def response_data():
         if 134 <= name:
 
             # convert to name
-            new_name = 'ft_au' + str(((name - 4) // 10) - 13)
+            position = ((name - 4) // 10) - 13
+            new_name = 'ft_au' + str(position)
 
-            response_data[new_name] = Spectrum(erg_struct, tally[1:, 0], tally[1:, 1])
+            response_data[new_name] = Spectrum(erg_struct, tally[1:, 0], tally[1:, 1], validate=False)
+            metadata.append(('ft', 'au', np.nan, position, name))
 
     # the indium foil tube ------------------------------------------------------
     scaling_factor = (7.31 * N_A * 1E-24 * 252) / (115 * 20)
@@ -146,9 +217,11 @@ def response_data():
         if 134 <= name:
 
             # convert to name
-            new_name = 'ft_in' + str(((name - 4) // 10) - 13)
+            position = ((name - 4) // 10) - 13
+            new_name = 'ft_in' + str(position)
 
-            response_data[new_name] = Spectrum(erg_struct, tally[1:, 0], tally[1:, 1])
+            response_data[new_name] = Spectrum(erg_struct, tally[1:, 0], tally[1:, 1], validate=False)
+            metadata.append(('ft', 'in', np.nan, position, name))
 
     # the bonner spheres ------------------------------------------------------
     V = 5.02655E-02
@@ -167,7 +240,8 @@ def response_data():
                 # convert to name
                 new_name = 'bs{}'.format(str(sphere_size)) + str(((name - 4) // 10) - 13)
 
-                response_data[new_name] = Spectrum(erg_struct, tally[1:, 0], tally[1:, 1])
+                response_data[new_name] = Spectrum(erg_struct, tally[1:, 0], tally[1:, 1], validate=False)
+                metadata.append(('bs', '', sphere_size, -1, name))
 
     # the point bonner spheres ------------------------------------------------
     scaling_factor = (rho * N_A * 1E-24 * V * 252) / M
@@ -180,13 +254,18 @@ def response_data():
             # convert to name
             new_name = 'pbs{}'.format(str(sphere_size))
 
-            response_data[new_name] = Spectrum(erg_struct, tally[1:, 0], tally[1:, 1])
+            response_data[new_name] = Spectrum(erg_struct, tally[1:, 0], tally[1:, 1], validate=False)
+            metadata.append(('pbs', '', sphere_size, -1, -1))
+
+    # stack the data and index it by the metadata
+    stack = SpectrumStack.from_spectra(response_data)
 
-    return response_data
+    return ResponseLibrary(stack.edges, stack.names, stack.int, stack.int_error, metadata)
 
 
 def plot_response_data():
     """Pretty straight-forward."""
+    import matplotlib.pyplot as plt
 
     # get the data
     responses = response_data()
@@ -200,18 +279,15 @@ def plot_response_data():
     ax.set_ylabel('Response Function $cm^2$')
 
     # establish colormap
-    num_au = [1 if 'ft_au' in name else 0 for name in responses.keys()].count(1)
-    color = plt.cm.terrain(np.linspace(0, 1, num_au))
+    gold = responses.query('ft', 'au')
+    color = plt.cm.terrain(np.linspace(0, 1, len(gold)))
 
     # loop through integral responses
-    for i, item in enumerate(responses.items()):
+    for i, item in enumerate(gold.items()):
 
         # parse out name and response
         name, response = item
 
-        if 'ft_au' not in name:
-            continue
-
         # plot the integral response
         ax.plot(*response.plot('plot', 'int'), label=name, color=color[i], lw=0.5)
         ax.errorbar(*response.plot('errorbar', 'int'), color=color[i], ls='None', lw=0.5)
@@ -229,17 +305,15 @@ def plot_response_data():
     ax.set_yscale('log')
 
     # establish colormap
-    color = plt.cm.rainbow(np.linspace(0, 1, len(responses)))
+    indium = responses.query('ft', 'in')
+    color = plt.cm.rainbow(np.linspace(0, 1, len(indium)))
 
     # loop through integral responses
-    for i, item in enumerate(responses.items()):
+    for i, item in enumerate(indium.items()):
 
         # parse out name and response
         name, response = item
 
-        if 'ft_in' not in name:
-            continue
-
         # plot the integral response
         ax.plot(*response.plot('plot', 'int'), label=name, color=color[i], lw=0.5)
         #ax.errorbar(*response.plot('errorbar', 'int'), color=color[i], ls='None', lw=0.5)
@@ -257,17 +331,15 @@ def plot_response_data():
     ax.set_yscale('log')
 
     # establish colormap
-    color = plt.cm.rainbow(np.linspace(0, 1, len(responses)))
+    spheres = responses.query('bs')
+    color = plt.cm.rainbow(np.linspace(0, 1, len(spheres)))
 
     # loop through integral responses
-    for i, item in enumerate(responses.items()):
+    for i, item in enumerate(spheres.items()):
 
         # parse out name and response
         name, response = item
 
-        if 'bs' not in name or 'p' in name:
-            continue
-
         # plot the integral response
         ax.plot(*response.plot('plot', 'int'), label=name, color=color[i], lw=0.5)
         #ax.errorbar(*response.plot('errorbar', 'int'), color=color[i], ls='None', lw=0.5)
@@ -285,17 +357,15 @@ def plot_response_data():
     ax.set_yscale('log')
 
     # establish colormap
-    color = plt.cm.rainbow(np.linspace(0, 1, len(responses)))
+    point_spheres = responses.query('pbs')
+    color = plt.cm.rainbow(np.linspace(0, 1, len(point_spheres)))
 
     # loop through integral responses
-    for i, item in enumerate(responses.items()):
+    for i, item in enumerate(point_spheres.items()):
 
         # parse out name and response
         name, response = item
 
-        if 'pbs' not in name:
-            continue
-
         # plot the integral response
         ax.plot(*response.plot('plot', 'int'), label=name, color=color[i], lw=0.5)
         ax.errorbar(*response.plot('errorbar', 'int'), color=color[i], ls='None', lw=0.5)
@@ -311,11 +381,15 @@ def plot_response_data():
 
 def plot_response_pdfs():
     """plot_response_pdfs"""
+    import matplotlib.pyplot as plt
 
     # get the data
     responses = response_data()
 
-    for j, detector in enumerate(('ft_au', 'bs', 'pbs')):
+    # the detector families, as queries of the responses
+    detectors = {'ft_au': ('ft', 'au'), 'bs': ('bs',), 'pbs': ('pbs',)}
+
+    for j, detector in enumerate(detectors):
         # plot response functions -------------------------------------------------
         fig = plt.figure(j + 3, figsize=(10, 6))
         ax = fig.add_subplot(111)
@@ -325,20 +399,15 @@ def plot_response_pdfs():
         ax.set_ylabel('pdf')
 
         # establish colormap
-        color = plt.cm.rainbow(np.linspace(0, 1, len(responses)))
+        family = responses.query(*detectors[detector])
+        color = plt.cm.rainbow(np.linspace(0, 1, len(family)))
 
         # loop through integral responses
-        for i, item in enumerate(responses.items()):
+        for i, item in enumerate(family.items()):
 
             # parse out name and response
             name, response = item
 
-            if detector is 'bs' and 'p' in name:
-                continue
-
-            if detector not in name:
-                continue
-
             # normalize responses
             response_pdf = Spectrum(response.edges, response.int / np.sum(response.int), response.int_error / np.sum(response.int))
 
@@ -357,6 +426,7 @@ def plot_response_pdfs():
 
 def plot_response_cdfs():
     """plot_response_pdfs"""
+    import matplotlib.pyplot as plt
 
     # get the data
     responses = response_data()
@@ -372,17 +442,15 @@ def plot_response_cdfs():
     ax.set_ylabel('cdf')
 
     # establish colormap
-    color = plt.cm.rainbow(np.linspace(0, 1, 11))
+    gold = responses.query('ft', 'au')
+    color = plt.cm.rainbow(np.linspace(0, 1, len(gold)))
 
     # loop through integral responses
-    for i, item in enumerate(responses.items()):
+    for i, item in enumerate(gold.items()):
 
         # parse out name and response
         name, response = item
 
-        if 'ft_au' not in name:
-            continue
-
         # normalize responses
         folded = response.int * flux_erg
         folded_response = Spectrum(response.edges, np.cumsum(folded) / np.sum(folded), 0)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from response import ResponseLibrary
+
+
+def mock_library():
+    """Produces a small library with foils and spheres out of order."""
+
+    # the metadata of each row
+    metadata = [('ft', 'au', np.nan, 0, 134), ('ft', 'au', np.nan, 1, 144), ('ft', 'au', np.nan, 2, 154),
+                ('ft', 'in', np.nan, 0, 134), ('bs', '', 0, -1, 124), ('bs', '', 2, -1, 124),
+                ('bs', '', 5, -1, 124), ('bs', '', 8, -1, 124), ('pbs', '', 8, -1, -1), ('pbs', '', 3, -1, -1)]
+    names = ['ft_au0', 'ft_au1', 'ft_au2', 'ft_in0', 'bs0-1', 'bs2-1', 'bs5-1', 'bs8-1', 'pbs8', 'pbs3']
+
+    # each row is filled with its index
+    values = np.repeat(np.arange(len(names), dtype=float)[:, np.newaxis], 3, axis=1)
+
+    return ResponseLibrary(np.array([1, 2, 3, 4.]), names, values, values / 10, metadata)
+
+
+def test_query():
+    """Queries the mock library by family and location."""
+
+    # load test values
+    library = mock_library()
+
+    # the bounds are inclusive
+    assert library.query('ft', 'au', 0, 1).names == ['ft_au0', 'ft_au1']
+    assert library.query('ft', 'au', 1).names == ['ft_au1', 'ft_au2']
+    assert library.query('ft', 'in').names == ['ft_in0']
+
+    # spheres of at least 5 inches
+    assert library.query('bs', low=5).names == ['bs5-1', 'bs8-1']
+    assert library.query('bs', low=3, high=4).names == []
+
+    # the point spheres are sorted by size
+    assert library.query('pbs').names == ['pbs3', 'pbs8']
+
+    # contiguous rows are views of the library, others are copies
+    gold = library.query('ft', 'au', 1)
+    assert np.shares_memory(gold.int, library.int)
+    assert np.array_equal(gold.int[:, 0], [1, 2])
+    assert not np.shares_memory(library.query('pbs').int, library.int)
+
+    # unknown families aren't in the index
+    with pytest.raises(KeyError):
+        library.query('ft', 'cu')
+
+    return
@@ -1,6 +1,6 @@
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from numpy.linalg import norm
-from scipy.optimize import basinhopping
 
 
 def preprocess(N, sigma2, R, f_def, params):
@@ -10,42 +10,70 @@ def preprocess(N, sigma2, R, f_def, params):
     if 'scale' in params:
         if params['scale']:
 
-            #
-            N0 = np.sum(R * f_def, axis=1)
+            # works on a single spectrum or a stack of them, one per row
+            N0 = np.dot(f_def, R.T)
 
             #
-            f_def *= np.average(N / N0)
+            f_def *= np.expand_dims(np.average(N / N0, axis=-1), -1)
 
     return N, sigma2, R, f_def, params
 
 
 def MAXED(N, sigma2, R, f_def, params):
     """The MAXED unfolding algorithm."""
+    from scipy.optimize import basinhopping, minimize
 
     # pull out algorithm-specific parameters
     Omega = params['Omega']
+    solver = params.get('solver', 'trust-exact')
 
     # create the function that we will maximize, Z
     def Z(lam, N, sigma2, R, f_def, Omega):
         """A function, the maximization of which is equivalent to the
         maximization of """
 
-        A = - np.sum(f_def * np.exp(- np.sum((lam * R.T).T, axis=0)))
+        A = - np.sum(f_def * np.exp(- np.dot(lam, R)))
         B = - (Omega * np.sum(lam**2 * sigma2))**(0.5)
         C = - np.sum(N * lam)
 
         # negate because it's a minimization
         return - (A + B + C)
 
+    # the analytic gradient of the negated Z
+    def Z_jac(lam, N, sigma2, R, f_def, Omega):
+        """The gradient of - Z with respect to lam."""
+
+        f = f_def * np.exp(- np.dot(lam, R))
+        s = (Omega * np.sum(lam**2 * sigma2))**(0.5)
+
+        return - np.dot(R, f) + (Omega * sigma2 * lam) / s + N
+
+    # the analytic hessian of the negated Z
+    def Z_hess(lam, N, sigma2, R, f_def, Omega):
+        """The hessian of - Z with respect to lam."""
+
+        f = f_def * np.exp(- np.dot(lam, R))
+        s = (Omega * np.sum(lam**2 * sigma2))**(0.5)
+        g = Omega * sigma2 * lam
+
+        return np.dot(R * f, R.T) + np.diag(Omega * sigma2 / s) - np.outer(g, g) / s**3
+
     # create a lambda
     lam = np.ones(len(N))
 
     # apply the simulated annealing to the Z
     mk = {'args': (N, sigma2, R, f_def, Omega)}
-    lam = basinhopping(Z, lam, minimizer_kwargs=mk).x
+    if solver == 'basinhopping':
+        lam = basinhopping(Z, lam, minimizer_kwargs=mk).x
+
+    # Z is concave, so a single deterministic solve finds the maximum
+    else:
+        hess = Z_hess if solver in ('Newton-CG', 'dogleg', 'trust-ncg', 'trust-krylov',
+                                    'trust-exact', 'trust-constr') else None
+        lam = minimize(Z, lam, method=solver, jac=Z_jac, hess=hess, **mk).x
 
     # back out the spectrum values from the lam
-    return f_def * np.exp(-np.sum((lam * R.T).T, axis=0))
+    return f_def * np.exp(- np.dot(lam, R))
 
 
 def Gravel(N, sigma2, R, f_def, params):
@@ -54,60 +82,138 @@ def Gravel(N, sigma2, R, f_def, params):
     # pull out algorithm-specific parameters
     max_iter = params['max_iter']
     tol = params['tol']
+    evolution = params.get('evolution', False)
+    verbose = params.get('verbose', False)
 
     # evolution
-    if 'evolution' in params:
-        evolution = params['evolution']
+    if evolution:
         evolution_list = []
 
+    # the weights only depend on the data, so compute them once
+    R = np.asarray(R, dtype=float)
+    RT = np.ascontiguousarray(R.T)
+    c = np.asarray(N, dtype=float)**2 / sigma2
+
+    # preallocate the work buffers reused on every iteration
+    f = np.array(f_def, dtype=float)
+    N0 = np.empty(len(N))
+    resid = np.empty(len(N))
+    w = np.empty(len(N))
+    log_term = np.empty(len(N))
+    top = np.empty(len(f))
+    bot = np.empty(len(f))
+
     # initalize
     iteration = 0
-    f = f_def
-    N0 = np.sum(R * f, axis=1)
+    np.dot(R, f, out=N0)
+    error = norm(np.subtract(N0, N, out=resid), ord=2)
 
     # begin iteration
-    while iteration < max_iter and norm(N0 - N, ord=2) > tol:
+    while iteration < max_iter and error > tol:
 
         # print info
-        message = 'Iteration {}: Error {}'.format(iteration, norm(N0 - N, ord=2))
-        print(message)
+        if verbose:
+            print('Iteration {}: Error {}'.format(iteration, error))
 
         # add evolution
         if evolution:
-            evolution_list.append(f)
+            evolution_list.append(f.copy())
 
-        # break down equations into simpler terms
-        a = (R * f)
-        b = np.sum(R * f, axis=1)
-        c = (N**2 / sigma2)
-        log_term = np.log(N / b)
+        # weight each response by c / (R f), the f_j factor of (R * f)
+        # cancels between the upper and lower portion of the exponential
+        np.divide(c, N0, out=w)
+        np.divide(N, N0, out=log_term)
+        np.log(log_term, out=log_term)
+        log_term *= w
 
         # compute the uper and lower portion of the exponential
-        top = np.sum((((a.T / b) * c) * log_term).T, axis=0)
-        bot = np.sum(((a.T / b) * c).T, axis=0)
+        np.dot(RT, log_term, out=top)
+        np.dot(RT, w, out=bot)
 
-        # compute the coefficient array
-        coef = np.exp(top / bot)
-
-        # update the new f
-        f = f * coef
+        # compute the coefficient array and update f in place
+        np.divide(top, bot, out=top)
+        np.exp(top, out=top)
+        f *= top
 
         # update f
-        N0 = np.sum(R * f, axis=1)
+        np.dot(R, f, out=N0)
+        error = norm(np.subtract(N0, N, out=resid), ord=2)
         iteration += 1
 
     # print info
-    message = 'Final Iteration {}: Error {}'.format(iteration, norm(N0 - N, ord=2))
-    print(message)
+    if verbose:
+        print('Final Iteration {}: Error {}'.format(iteration, error))
 
     # add evolution
     if evolution:
-        evolution_list.append(f)
+        evolution_list.append(f.copy())
         return f, evolution_list
 
     return f
 
 
+def Gravel_batch(N, sigma2, R, f_def, params):
+    """The Gravel algorithm applied to a stack of measurements at once, with
+    one row of N, sigma2 and f_def per unfold."""
+
+    # pull out algorithm-specific parameters
+    max_iter = params['max_iter']
+    tol = params['tol']
+    verbose = params.get('verbose', False)
+
+    # the weights only depend on the data, so compute them once
+    R = np.asarray(R, dtype=float)
+    c = np.asarray(N, dtype=float)**2 / sigma2
+
+    # preallocate the work buffers reused on every iteration
+    f = np.array(f_def, dtype=float)
+    N0 = np.empty(c.shape)
+    resid = np.empty(c.shape)
+    w = np.empty(c.shape)
+    log_term = np.empty(c.shape)
+    top = np.empty(f.shape)
+    bot = np.empty(f.shape)
+
+    # initalize
+    iteration = 0
+    np.dot(f, R.T, out=N0)
+    active = norm(np.subtract(N0, N, out=resid), ord=2, axis=1) > tol
+
+    # begin iteration, until every row has converged
+    while iteration < max_iter and np.any(active):
+
+        # print info
+        if verbose:
+            print('Iteration {}: {} unconverged'.format(iteration, np.count_nonzero(active)))
+
+        # weight each response by c / (R f)
+        np.divide(c, N0, out=w)
+        np.divide(N, N0, out=log_term)
+        np.log(log_term, out=log_term)
+        log_term *= w
+
+        # compute the uper and lower portion of the exponential
+        np.dot(log_term, R, out=top)
+        np.dot(w, R, out=bot)
+
+        # compute the coefficient array, leaving converged rows untouched
+        np.divide(top, bot, out=top)
+        top *= active[:, np.newaxis]
+        np.exp(top, out=top)
+        f *= top
+
+        # update f
+        np.dot(f, R.T, out=N0)
+        active &= norm(np.subtract(N0, N, out=resid), ord=2, axis=1) > tol
+        iteration += 1
+
+    # print info
+    if verbose:
+        print('Final Iteration {}: {} unconverged'.format(iteration, np.count_nonzero(active)))
+
+    return f
+
+
 def unfold(N, sigma2, R, f_def, method='MAXED', params={}):
     """A utility that deconvolutes (unfolds) neutron spectral data given
     typical inputs and a selection of unfolding algorithm."""
@@ -130,3 +236,80 @@ def unfold(N, sigma2, R, f_def, method='MAXED', params={}):
         return Gravel(N, sigma2, R, f_def, params)
 
     return
+
+
+def unfold_batch(N, sigma2, R, f_def, method='Gravel', params={}):
+    """Unfolds a stack of measurements that share a response matrix. Each row
+    of N and sigma2 is one measurement set, and the solutions are returned
+    stacked in the same order."""
+
+    # check input
+    available_methods = ('MAXED', 'Gravel')
+    assert method in available_methods, 'method must by literal in {}'.format(available_methods)
+    N, sigma2 = np.atleast_2d(N, sigma2)
+    assert N.shape == sigma2.shape, 'N and sigma2 must be the same shape.'
+    assert R.shape == (N.shape[1], len(f_def)), 'Shape of R must be consistent with other inputs.'
+
+    # every row starts from its own copy of the default spectrum
+    f_def = np.tile(np.asarray(f_def, dtype=float), (len(N), 1))
+
+    # preprocess the data
+    N, sigma2, R, f_def, params = preprocess(N, sigma2, R, f_def, params)
+
+    # MAXED is a separate optimization per row
+    if method == 'MAXED':
+        return np.array([MAXED(n, s2, R, f, params) for n, s2, f in zip(N, sigma2, f_def)])
+
+    # Gravel iterates on the whole stack at once
+    elif method == 'Gravel':
+        return Gravel_batch(N, sigma2, R, f_def, params)
+
+    return
+
+
+def unfold_samples(N, sigma2, R, f_def, N_error, R_error, seed, samples, method='Gravel', params={}):
+    """Unfolds a number of measurement sets and response matrices perturbed
+    by their errors, all drawn from a single seeded random stream."""
+
+    # each sample needs a plain spectrum, not the evolution
+    params = dict(params, evolution=False)
+
+    # create the random stream
+    rng = np.random.default_rng(seed)
+
+    # unfold each perturbed sample
+    solutions = np.empty((samples, len(f_def)))
+    for i in range(samples):
+
+        # perturb the data, keeping the responses physical
+        N_i = N + N_error * rng.standard_normal(N.shape)
+        R_i = np.clip(R + R_error * rng.standard_normal(R.shape), 0, None)
+
+        solutions[i] = unfold(N_i, sigma2, R_i, np.array(f_def, dtype=float), method, params)
+
+    return solutions
+
+
+def unfold_uncertainty(N, sigma2, R, f_def, N_error, R_error, samples=1000, method='Gravel',
+                       params={}, seed=None, processes=None, chunk_size=100):
+    """Propagates the errors in N and R through the unfolding by Monte Carlo
+    sampling across a process pool. Returns the mean, standard deviation and
+    covariance of the unfolded spectrum.
+
+    The samples are split into chunks of chunk_size, each with its own
+    random stream spawned from seed, so the result for a given seed does not
+    depend on the number of processes."""
+
+    # split the samples into chunks, each with its own stream
+    chunks = [chunk_size] * (samples // chunk_size)
+    if samples % chunk_size:
+        chunks.append(samples % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+
+    # unfold the chunks in parallel
+    args = (N, sigma2, R, f_def, N_error, R_error)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(unfold_samples, *args, s, n, method, params) for s, n in zip(seeds, chunks)]
+        solutions = np.concatenate([future.result() for future in futures])
+
+    return np.mean(solutions, axis=0), np.std(solutions, axis=0, ddof=1), np.cov(solutions, rowvar=False)
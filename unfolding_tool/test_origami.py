@@ -66,5 +66,82 @@ def test_origami():
 
     return
 
+
+def test_gravel():
+    """Checks that Gravel reproduces the detector responses and reports its
+    evolution when asked."""
+
+    # load test values
+    f_true, f_def, N, sigma2, R, edges = test_values()
+
+    # unfold, keeping the evolution
+    params = {'max_iter': 1000, 'tol': 1E-4, 'evolution': True}
+    f, evolution = ori.unfold(N, sigma2, R, f_def, method='Gravel', params=params)
+
+    # the solution should fold back into the measured responses
+    assert np.allclose(R @ f, N, atol=1E-4)
+
+    # the first iterate is the default spectrum and the last is the solution
+    assert np.allclose(evolution[0], f_def)
+    assert np.allclose(evolution[-1], f)
+
+    return
+
+
+def test_maxed():
+    """Checks that the analytic MAXED solvers agree with each other."""
+
+    # load test values
+    f_true, f_def, N, sigma2, R, edges = test_values()
+
+    # unfold with both the hessian and gradient-only solvers
+    f_exact = ori.unfold(N, sigma2, R, f_def, method='MAXED', params={'Omega': 3})
+    f_lbfgs = ori.unfold(N, sigma2, R, f_def, method='MAXED', params={'Omega': 3, 'solver': 'L-BFGS-B'})
+
+    # both should find the same maximum of Z
+    assert np.allclose(f_exact, f_lbfgs, rtol=1E-4)
+
+    return
+
+
+def test_unfold_batch():
+    """Checks that a batched Gravel unfold matches unfolding each row."""
+
+    # load test values and stack a few scaled copies of the responses
+    f_true, f_def, N, sigma2, R, edges = test_values()
+    N_stack = np.outer([1.0, 1.5, 2.0], N)
+    sigma2_stack = np.outer([1.0, 1.5, 2.0], sigma2)
+
+    # unfold the whole stack at once
+    params = {'max_iter': 1000, 'tol': 1E-4}
+    f_stack = ori.unfold_batch(N_stack, sigma2_stack, R, f_def, method='Gravel', params=params)
+
+    # compare with unfolding each row on its own
+    for n, s2, f in zip(N_stack, sigma2_stack, f_stack):
+        assert np.allclose(f, ori.unfold(n, s2, R, f_def, method='Gravel', params=params))
+
+    return
+
+
+def test_unfold_uncertainty():
+    """Checks that the sampled uncertainty is reproducible for a seed,
+    regardless of the number of processes."""
+
+    # load test values
+    f_true, f_def, N, sigma2, R, edges = test_values()
+
+    # sample the same seed with different pool sizes
+    params = {'max_iter': 100, 'tol': 1E-4}
+    args = (N, sigma2, R, f_def, N * 0.05, R * 0.05)
+    mean1, std1, cov1 = ori.unfold_uncertainty(*args, samples=50, params=params, seed=1, processes=1, chunk_size=20)
+    mean2, std2, cov2 = ori.unfold_uncertainty(*args, samples=50, params=params, seed=1, processes=2, chunk_size=20)
+
+    # check the results
+    assert np.array_equal(mean1, mean2)
+    assert np.array_equal(cov1, cov2)
+    assert np.allclose(np.diag(cov1), std1**2)
+
+    return
+
 if __name__ == '__main__':
     test_origami()
@@ -0,0 +1,139 @@
+import os
+import re
+import glob
+import numpy as np
+from datetime import datetime
+from parse_cache import parse_files
+
+# every field read from a Genie2K .RPT report, as named alternatives, so the
+# whole report is tokenized in a single pass
+report_pattern = re.compile(r'Acquisition Started\s+: (?P<start>\d\d?/\d\d?/\d{4}\s+\d\d?:\d\d:\d\d [AP]M)'
+                            r'|Live Time\s+:\s+(?P<live>\d+\.\d) seconds'
+                            r'|Real Time\s+:\s+(?P<real>\d+\.\d) seconds'
+                            r'|(?P<nuclide>[A-Za-z]{1,2}-\d+m?)\s+\d\.\d{3}\s+'
+                            r'(?P<activity>\d\.\d{6}E[+-]\d{3})\s+(?P<error>\d\.\d{6}E[+-]\d{3})')
+
+# the section ids of the acquisition parameters and the channel data in a
+# .CNF file, as found in the section headers
+cnf_acquisition = 0x00012000
+cnf_channels = 0x00012005
+
+# the offset of the .CNF epoch, 17 Nov 1858, from the unix epoch in seconds
+cnf_epoch = 3506716800
+
+# the measurement records of a counting campaign
+record_dtype = [('name', 'U32'), ('activity', float), ('activity_error', float),
+                ('live', float), ('real', float), ('start', 'datetime64[s]')]
+
+
+def parse_report(filename):
+    """Reads the acquisition start, the live and real times, and the
+    interference corrected activity and uncertainty (uCi) of every nuclide in
+    a Genie2K .RPT report. A report may repeat its header, in which case the
+    first start and times and the last activity of each nuclide are kept."""
+
+    # read the file
+    with open(filename, 'r') as F:
+        output = F.read()
+
+    # sort each match into its field
+    fields = {}
+    activities = {}
+    for match in report_pattern.finditer(output):
+        if match.group('nuclide'):
+            activities[match.group('nuclide').upper()] = match.group('activity', 'error')
+        else:
+            fields.setdefault(match.lastgroup, match.group(match.lastgroup))
+
+    # convert the start to a timestamp
+    start = datetime.strptime(' '.join(fields['start'].split()), '%m/%d/%Y %I:%M:%S %p')
+
+    return {'nuclides': np.array(list(activities), dtype=str),
+            'activities': np.array(list(activities.values()), dtype=float).reshape(-1, 2),
+            'times': np.array([fields['live'], fields['real']], dtype=float),
+            'start': np.array(start, dtype='datetime64[s]')}
+
+
+def parse_cnf(filename):
+    """Reads the channel counts, the live and real times, and the acquisition
+    start of a Genie2K .CNF spectrum. The file begins with a table of section
+    headers, each holding a section id, its size and its offset."""
+
+    # read the file
+    with open(filename, 'rb') as F:
+        data = F.read()
+
+    # walk the table of section headers until it ends
+    sections = {}
+    header = 0x70
+    while header + 0x30 <= len(data) and int.from_bytes(data[header:header + 4], 'little'):
+        section_id = int.from_bytes(data[header:header + 4], 'little')
+        size = int.from_bytes(data[header + 6:header + 8], 'little')
+        offset = int.from_bytes(data[header + 10:header + 14], 'little')
+        sections[section_id] = offset, size
+        header += 0x30
+
+    # the channel data follows a 0x200 byte header, the first two channels
+    # hold no counts
+    offset, size = sections[cnf_channels]
+    counts = np.frombuffer(data, dtype='<u4', count=(size - 0x200) // 4, offset=offset + 0x200).copy()
+
+    # the acquisition parameters are offset within their section
+    offset = sections[cnf_acquisition][0]
+    parameters = offset + 0x30 + int.from_bytes(data[offset + 0x24:offset + 0x26], 'little')
+
+    # times are stored as negated 64 bit counts of 100 ns
+    real, live = [-int.from_bytes(data[parameters + i:parameters + i + 8], 'little', signed=True) * 1E-7
+                  for i in (0x09, 0x11)]
+
+    # the start is an unsigned count of 100 ns from the cnf epoch
+    start = int.from_bytes(data[parameters + 0x01:parameters + 0x09], 'little') // 10000 - cnf_epoch * 1000
+
+    return {'counts': counts,
+            'times': np.array([live, real]),
+            'start': np.array(start, dtype='datetime64[ms]')}
+
+
+def read_campaign(directory, nuclide, processes=None):
+    """Reads every .RPT report in a directory, across a pool of processes,
+    into a structured array of records for one nuclide, sorted by name. The
+    activity is nan for counts where the nuclide wasn't identified."""
+
+    # find the reports
+    filenames = sorted(glob.glob(os.path.join(directory, '*.RPT')))
+
+    # create a structure to house the records
+    records = np.zeros(len(filenames), dtype=record_dtype)
+
+    # parse the reports, reusing the cached ones
+    for record, filename, report in zip(records, filenames, parse_files(filenames, parse_report, processes)):
+
+        # name the record by the file
+        record['name'] = os.path.splitext(os.path.basename(filename))[0]
+
+        # grab the activity of the nuclide
+        found = report['nuclides'] == nuclide.upper()
+        activity = report['activities'][found][-1] if found.any() else (np.nan, np.nan)
+        record['activity'], record['activity_error'] = activity
+
+        # and the counting information
+        record['live'], record['real'] = report['times']
+        record['start'] = report['start']
+
+    return records
+
+
+def read_spectra(directory, processes=None):
+    """Reads every .CNF spectrum in a directory, across a pool of processes,
+    returning their names, sorted, and a stack of their channel counts."""
+
+    # find the spectra
+    filenames = sorted(glob.glob(os.path.join(directory, '*.CNF')))
+
+    # parse the spectra, reusing the cached ones
+    spectra = parse_files(filenames, parse_cnf, processes)
+
+    # stack the counts
+    names = [os.path.splitext(os.path.basename(filename))[0] for filename in filenames]
+
+    return names, np.array([spectrum['counts'] for spectrum in spectra])
@@ -0,0 +1,40 @@
+import numpy as np
+from datetime import datetime
+from parse_cache import mapped_parse
+
+
+def parse_spe(filename):
+    """Reads the channel counts, the live and real times, and the start of
+    the measurement from an ORTEC Maestro .Spe spectrum. The sections are
+    located by their headers, so any number of channels can be read."""
+
+    # read the file
+    with open(filename, 'r') as F:
+        output = F.read()
+
+    # the start, after the $DATE_MEA: header
+    date = output[output.index('$DATE_MEA:'):].split(None, 3)[1:3]
+    start = datetime.strptime(' '.join(date), '%m/%d/%Y %H:%M:%S')
+
+    # the live and real times, after the $MEAS_TIM: header
+    times = output[output.index('$MEAS_TIM:'):].split(None, 3)[1:3]
+
+    # the $DATA: header is followed by the first and last channels, then a
+    # count for each channel
+    section = output.index('$DATA:') + len('$DATA:')
+    first, last, counts = output[section:].split(None, 2)
+    num_channels = int(last) - int(first) + 1
+
+    # convert all of the counts at once
+    counts = np.fromstring(counts, dtype=np.int64, count=num_channels, sep=' ')
+
+    return {'counts': counts,
+            'times': np.array(times, dtype=float),
+            'start': np.array(start, dtype='datetime64[s]')}
+
+
+def read_spe(filename):
+    """Returns the parsed contents of a .Spe spectrum, parsing it only the
+    first time it is read and memory mapping the binary cache after that."""
+
+    return mapped_parse(filename, parse_spe)
@@ -0,0 +1,101 @@
+import re
+import mmap
+import numpy as np
+from itertools import islice
+from contextlib import contextmanager
+
+# the tally number following a '1tally' marker
+tally_number_pattern = re.compile(rb'\s*(\d+)')
+
+# the number of matches converted to floats at once
+chunk_size = 8192
+
+# a tally value and its relative error
+tally_pattern = re.compile(rb'(\d.\d\d\d\d\dE[+-]\d\d) (\d.\d\d\d\d)')
+
+# a tally value and its relative error, as indented in the point bonner
+# sphere outputs
+pbs_tally_pattern = re.compile(rb'                 (\d.\d\d\d\d\dE[+-]\d\d) (\d.\d\d\d\d)')
+
+# an energy bin followed by the tally value and its relative error, as in
+# the nebp flux outputs
+flux_pattern = re.compile(rb'    \d.\d\d\d\dE[+-]\d\d   (\d.\d\d\d\d\dE[+-]\d\d) (\d.\d\d\d\d)')
+
+
+@contextmanager
+def open_output(filename):
+    """Memory maps an mcnp output file, read only, so that it can be searched
+    without ever reading the whole file into a string."""
+
+    with open(filename, 'rb') as F:
+        with mmap.mmap(F.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def tally_sections(mm):
+    """Returns the (start, end) byte offsets of the text following each
+    '1tally' marker in a mapped output file, up to the next marker or the
+    end of the file."""
+
+    # find every marker with byte searches
+    markers = []
+    position = mm.find(b'1tally')
+    while position != -1:
+        markers.append(position)
+        position = mm.find(b'1tally', position + 1)
+
+    # each section runs from the end of its marker to the next one
+    ends = markers[1:] + [len(mm)]
+
+    return [(start + len(b'1tally'), end) for start, end in zip(markers, ends)]
+
+
+def tally_number(mm, start):
+    """Reads the tally number at the start of a tally section."""
+
+    return int(tally_number_pattern.match(mm, start).group(1))
+
+
+def count_rows(mm, pattern, start=0, end=None):
+    """Counts the matches of a compiled bytes pattern between two offsets of
+    a mapped output file, without holding any of them."""
+
+    # default to the end of the file
+    end = len(mm) if end is None else end
+
+    return sum(1 for match in pattern.finditer(mm, start, end))
+
+
+def read_rows(mm, pattern, out, start=0, end=None, skip=0):
+    """Fills the rows of out with the groups of successive matches of a
+    compiled bytes pattern between two offsets of a mapped output file,
+    skipping the first few matches. Returns the number of rows filled."""
+
+    # default to the end of the file
+    end = len(mm) if end is None else end
+
+    # only tokenize as many matches as there are rows
+    matches = islice(pattern.finditer(mm, start, end), skip, skip + len(out))
+
+    # convert the columns of a bounded chunk of matches at a time, so memory
+    # doesn't grow with the size of the output
+    filled = 0
+    while True:
+        rows = [match.groups() for match in islice(matches, chunk_size)]
+        if not rows:
+            break
+        out[filled:filled + len(rows)] = np.array(rows, dtype=bytes).astype(float)
+        filled += len(rows)
+
+    return filled
+
+
+def read_table(mm, pattern, start=0, end=None):
+    """Reads the groups of every match of a compiled bytes pattern between two
+    offsets of a mapped output file into the rows of a float array."""
+
+    # size the array by counting the matches, then fill it
+    out = np.empty((count_rows(mm, pattern, start, end), pattern.groups))
+    read_rows(mm, pattern, out, start, end)
+
+    return out
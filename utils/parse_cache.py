@@ -0,0 +1,114 @@
+import os
+import hashlib
+import tempfile
+import numpy as np
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+import sys
+sys.path.insert(0, '../')
+import paths
+
+# where parsed files are cached between runs
+cache_path = paths.main_path + '/cache'
+
+# the version of the cache format, which is part of every cache key, so
+# bumping it retires every cached file
+cache_version = 1
+
+
+def cache_file(filename, parser, extension='.npz'):
+    """Returns the cache file for a file and parser, named by a hash of the
+    file's path, size and modification time along with the cache version and
+    the parser's name and bytecode, so editing a parser retires its cache."""
+
+    # grab the file identity
+    stat = os.stat(filename)
+    identity = '{}:{}:{}:{}:{}.{}'.format(cache_version, os.path.abspath(filename), stat.st_size,
+                                          stat.st_mtime_ns, parser.__module__, parser.__name__)
+
+    # and the parser's
+    key = hashlib.sha1(identity.encode())
+    key.update(parser.__code__.co_code)
+
+    return os.path.join(cache_path, key.hexdigest() + extension)
+
+
+def write_cache(cached, save, data):
+    """Saves data with save into a temporary file beside the cache file and
+    then moves it into place, so an interrupted write never leaves a partial
+    cache file behind."""
+
+    os.makedirs(cache_path, exist_ok=True)
+
+    # write the temporary file
+    with tempfile.NamedTemporaryFile(dir=cache_path, suffix='.tmp', delete=False) as F:
+        try:
+            save(F, data)
+        except BaseException:
+            F.close()
+            os.remove(F.name)
+            raise
+
+    # replacing is atomic, so the cache file is either missing or whole
+    os.replace(F.name, cached)
+
+    return
+
+
+def cached_parse(filename, parser):
+    """Returns the dict of arrays produced by parser(filename), loading it
+    from the on-disk cache when the file hasn't changed since it was last
+    parsed and storing it there otherwise."""
+
+    # name of the cached version of the file
+    cached = cache_file(filename, parser)
+
+    # load the cached arrays if they exist
+    if os.path.exists(cached):
+        with np.load(cached) as data:
+            return {key: data[key] for key in data.files}
+
+    # otherwise parse the file and cache the result
+    parsed = parser(filename)
+    write_cache(cached, lambda F, data: np.savez(F, **data), parsed)
+
+    return parsed
+
+
+def mapped_parse(filename, parser):
+    """Like cached_parse, but the arrays are cached as the fields of a single
+    record in a .npy file, which is memory mapped rather than read, so only
+    the parts of the arrays that are used are ever loaded. The arrays
+    returned are read only views of the map."""
+
+    # name of the cached version of the file
+    cached = cache_file(filename, parser, '.npy')
+
+    # parse the file and cache the result as a record, if it isn't yet
+    if not os.path.exists(cached):
+        parsed = parser(filename)
+        record = np.zeros((), dtype=[(key, value.dtype, value.shape) for key, value in parsed.items()])
+        for key, value in parsed.items():
+            record[key] = value
+        write_cache(cached, np.save, record)
+
+    # map the record
+    record = np.load(cached, mmap_mode='r')
+
+    return {key: record[key] for key in record.dtype.names}
+
+
+def parse_files(filenames, parser, processes=None):
+    """Applies cached_parse to each of the files, parsing any that aren't
+    cached yet across a pool of processes."""
+
+    # find the files that still need to be parsed
+    uncached = [f for f in filenames if not os.path.exists(cache_file(f, parser))]
+
+    # parse those in parallel
+    parsed = {}
+    if uncached:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            parsed = dict(zip(uncached, executor.map(cached_parse, uncached, repeat(parser))))
+
+    return [parsed[f] if f in parsed else cached_parse(f, parser) for f in filenames]
@@ -0,0 +1,118 @@
+import numpy as np
+from functools import lru_cache
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from maestro import read_spe
+
+
+def model(x, A, B, C, D, E):
+    """An exponential continuum plus a gaussian peak of area C, width D and
+    centroid E, as fit to the bonner sphere pulse height spectra."""
+    return A * np.exp(-B * x) + C * (1 / np.sqrt(2 * np.pi * D**2)) * np.exp(-(x - E)**2 / (2 * D**2))
+
+
+def jacobian(x, A, B, C, D, E):
+    """The derivatives of the model with respect to each of its parameters,
+    as the columns of an array."""
+
+    # the continuum and the unit area peak
+    continuum = np.exp(-B * x)
+    peak = (1 / np.sqrt(2 * np.pi * D**2)) * np.exp(-(x - E)**2 / (2 * D**2))
+
+    return np.column_stack((continuum,
+                            -A * x * continuum,
+                            peak,
+                            C * peak * ((x - E)**2 / D**3 - 1 / D),
+                            C * peak * (x - E) / D**2))
+
+
+def fit_spectrum(ydata, p0):
+    """Fits the model to the counts of a spectrum, with channels counted from
+    zero, returning the optimal parameters."""
+    from scipy.optimize import curve_fit
+
+    # the channels
+    xdata = np.arange(len(ydata), dtype=float)
+
+    # fit the curve
+    popt, pcov = curve_fit(model, xdata, ydata, p0=p0, jac=jacobian)
+
+    return popt
+
+
+def fit_spectra(spectra, p0, processes=None):
+    """Fits the model to each of the spectra concurrently, from the same
+    initial parameters, returning the optimal parameters of each as rows."""
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return np.array(list(executor.map(fit_spectrum, spectra, repeat(p0))))
+
+
+def dead_time(spectra, live, real):
+    """The non-paralyzable dead time per count, (real - live) / counts, that
+    the live and real clocks of each of a stack of spectra imply."""
+    return (real - live) / np.sum(spectra, axis=-1)
+
+
+def count_rates(spectra, live, real, tau=None):
+    """Converts a stack of spectra to true count rates, channel by channel,
+    with a non-paralyzable dead time model, n = m / (1 - m tau), where m is
+    the total observed rate over the real time. Without a dead time, each
+    spectrum's own clocks set it, which reduces to dividing by live time."""
+
+    # the fraction of the real time each detector was live, which the clocks
+    # give directly without a dead time
+    if tau is None:
+        live_fraction = live / real
+    else:
+        live_fraction = 1 - (np.sum(spectra, axis=-1) / real) * tau
+
+    return spectra / (real * live_fraction)[..., np.newaxis]
+
+
+@lru_cache(maxsize=8)
+def read_rates(filenames, background_filenames, tau=None):
+    """Reads the .Spe spectra and their backgrounds, either of which may be
+    None, and returns the background subtracted count rate of every channel
+    of every spectrum, along with their live times. All of the spectra are
+    converted and subtracted at once, and the result is cached."""
+
+    # read the spectra and their clocks
+    spectra = np.array([read_spe(filename)['counts'] for filename in filenames], dtype=float)
+    live, real = np.array([read_spe(filename)['times'] for filename in filenames]).T
+
+    # a missing background is read as an empty spectrum with unit clocks
+    empty = {'counts': np.zeros(spectra.shape[1]), 'times': np.ones(2)}
+    backgrounds = [read_spe(filename) if filename else empty for filename in background_filenames]
+    background_live, background_real = np.array([background['times'] for background in backgrounds]).T
+    backgrounds = np.array([background['counts'] for background in backgrounds], dtype=float)
+
+    # subtract the background rates
+    rates = count_rates(spectra, live, real, tau) - count_rates(backgrounds, background_live, background_real)
+
+    # the cached data is shared, so protect it
+    rates.setflags(write=False)
+    live.setflags(write=False)
+
+    return rates, live
+
+
+def plot_fit(ydata, popt, filename, figure=0):
+    """Saves a plot of the counts of a spectrum against its fitted model."""
+    import matplotlib.pyplot as plt
+
+    # the channels
+    xdata = np.arange(len(ydata))
+
+    # plot fit
+    fig = plt.figure(figure)
+    ax = fig.add_subplot(111)
+    ax.set_xlabel('Channel')
+    ax.set_ylabel('Counts')
+    ax.plot(xdata, ydata, color='navy', ls='None', marker='.', markersize=0.3, label='Data')
+    ax.plot(xdata, model(xdata, *popt), color='seagreen', label='Model')
+    ax.legend()
+    fig.savefig(filename, dpi=300)
+    fig.clear()
+
+    return
@@ -1,99 +1,249 @@
 import numpy as np
 
 
-class Spectrum(object):
+def strictly_monotonic(edges):
+    """Checks that bin edges are unique and strictly increasing or decreasing,
+    with a single check on the signs of their differences."""
+    return abs(np.sum(np.sign(np.diff(edges)))) == len(edges) - 1
 
-    """A useful container for nuclear engineering applications.
-    This description will be updated in the future."""
 
-    def __init__(self, edges, values, error, form='int', floor=0):
-        """Create a spectrum object and its associated values.
-        Also calculates some useful things."""
+def step_coordinates(edges, values):
+    """Returns the x and y points that plot values as steps between the bin
+    edges with plt.plot. Values can be a single spectrum or a stack of them
+    with one per row, which gives a stack of y points that can be plotted all
+    at once as plt.plot(X, Y.T)."""
 
-        # check array inputs
-        assert type(edges) in (list, tuple, np.ndarray), "Bin edges must be of type list, tuple, or ndarray."
-        assert type(values) in (list, tuple, np.ndarray), "Values must be of type list, tuple, or ndarray."
-        assert type(error) in (int, list, tuple, np.ndarray), "Error must be of type int, list, tuple, or ndarray."
-        assert type(floor) in (int, float), "Floor must be either int or float."
+    # create doubles of bin edges and values
+    X = np.repeat(edges, 2)[1:-1]
+    Y = np.repeat(values, 2, axis=-1)
 
-        # check spectrum form
-        message = "Spectrum form option must be literal in ('int', 'integral', 'dif', 'diff', 'differential')."
-        assert form in ('int', 'integral', 'dif', 'diff', 'differential'), message
+    return X, Y
 
-        # allow error to be input as 0, which implies that all error is zero
-        if type(error) is int:
-            assert error is 0, "Error integer input only allows 0."
 
-            # then rewrite error
-            error = np.zeros(len(values))
+def propagate(operator, a, a_error, b, b_error):
+    """Applies an arithmetic operator, literal in ('add', 'sub', 'mul', 'div'),
+    to two sets of values and propagates their errors to first order."""
+
+    # sums and differences add errors in quadrature
+    if operator in ('add', 'sub'):
+        values = a + b if operator == 'add' else a - b
+        error = np.hypot(a_error, b_error)
+
+    # products and quotients add relative errors in quadrature
+    elif operator == 'mul':
+        values = a * b
+        error = np.hypot(a_error * b, a * b_error)
+
+    elif operator == 'div':
+        values = a / b
+        error = np.hypot(a_error / b, a * b_error / b**2)
+
+    return values, error
+
+
+def collapse_operator(widths, edge_indices):
+    """Builds the matrix that collapses fine group values onto the coarse
+    groups bounded by edge_indices, as a bin width weighted average over each
+    coarse group. Multiplying a stack of fine group values by its transpose
+    collapses all of them at once."""
+
+    # create the operator
+    operator = np.zeros((len(edge_indices) - 1, len(widths)))
+
+    # sum over the bounds with the weighting
+    for i in range(len(edge_indices) - 1):
+
+        # the fine bins that fall in the coarse bin
+        bounds = slice(edge_indices[i], edge_indices[i + 1] + 1)
 
-        # check val and err lengths
+        # find the fraction of the total response that makes up the bin
+        operator[i, bounds] = widths[bounds] / np.sum(widths[bounds])
+
+    return operator
+
+
+def check_inputs(edges, values, error, form, floor):
+    """Checks that the inputs of a spectrum are consistent."""
+
+    # check array inputs
+    assert isinstance(edges, (list, tuple, np.ndarray)), "Bin edges must be of type list, tuple, or ndarray."
+    assert isinstance(values, (list, tuple, np.ndarray)), "Values must be of type list, tuple, or ndarray."
+    assert isinstance(error, (int, list, tuple, np.ndarray)), "Error must be of type int, list, tuple, or ndarray."
+    assert isinstance(floor, (int, float)), "Floor must be either int or float."
+
+    # check spectrum form
+    message = "Spectrum form option must be literal in ('int', 'integral', 'dif', 'diff', 'differential')."
+    assert form in ('int', 'integral', 'dif', 'diff', 'differential'), message
+
+    # allow error to be input as 0, which implies that all error is zero
+    if isinstance(error, int):
+        assert error == 0, "Error integer input only allows 0."
+
+    # check val and err lengths
+    else:
         message = "Values and error must have same length."
         assert len(values) == len(error), message
 
-        # check edges and val lengths
-        message = "Inconsistency in number of edges/values."
-        assert len(edges) in (len(values), len(values) + 1), message
+    # check edges and val lengths
+    message = "Inconsistency in number of edges/values."
+    assert len(edges) in (len(values), len(values) + 1), message
+
+    # guarantee that bin edges are unique and increasing or decreasing
+    message = "Bin edge values must be unique and strictly increasing or decreasing."
+    assert strictly_monotonic(edges), message
 
-        # guarantee that bin edges are unique and increasing or decreasing
-        message = "Bin edge values must be unique and strictly increasing or decreasing."
-        assert all(x < y for x, y in zip(edges, edges[1:])) or all(x > y for x, y in zip(edges, edges[1:])), message
+    return
+
+
+class Spectrum(object):
+
+    """A useful container for nuclear engineering applications.
+    This description will be updated in the future."""
+
+    # only one form of the data is stored, the rest is derived lazily
+    __slots__ = ('edges', '_widths', '_midpoints', '_int', '_int_error', '_diff', '_diff_error', '_steps')
+
+    def __init__(self, edges, values, error, form='int', floor=0, validate=True):
+        """Create a spectrum object and its associated values.
+        Also calculates some useful things. Trusted callers that already
+        guarantee consistent inputs can skip the checks with validate=False."""
+
+        # check the inputs
+        if validate:
+            check_inputs(edges, values, error, form, floor)
+
+        # allow error to be input as 0, which implies that all error is zero
+        if isinstance(error, int):
+            error = np.zeros(len(values))
 
         # convert all data types to numpy arrays
         values = np.array(values)
         error = np.array(error)
 
-        # special handling for different size edges
+        # special handling for different size edges, sharing the edges
+        # array when it can be used as is
         if len(edges) == len(values):
             edges = np.concatenate((np.array([floor]), np.array(edges)))
         elif len(edges) == len(values) + 1:
-            edges = np.array(edges)
-
-        # calculate midpoints and bin edges
-        self.widths = edges[1:] - edges[:-1]
-        self.midpoints = (edges[1:] + edges[:-1]) / 2
+            edges = np.asarray(edges)
 
         # store other primary values
         self.edges = edges
 
-        # store values and error in differential and integral forms
+        # the derived values are computed when first needed
+        self._widths = None
+        self._midpoints = None
+        self._steps = None
+
+        # store values and error in only the given form
+        self._int, self._int_error, self._diff, self._diff_error = None, None, None, None
         if form in ('int', 'integral'):
-            self.int = values
-            self.int_error = error
-            self.diff = self.int / self.widths
-            self.diff_error = self.int_error / self.widths
+            self._int = values
+            self._int_error = error
 
         elif form in ('dif', 'diff', 'differential'):
-            self.diff = values
-            self.diff_error = error
-            self.int = self.diff * self.widths
-            self.int_error = self.diff_error * self.widths
+            self._diff = values
+            self._diff_error = error
 
         return
 
-    def __add__(self):
-        raise NotImplementedError
-
-    def __radd__(self):
-        raise NotImplementedError
-
-    def __sub__(self):
-        raise NotImplementedError
-
-    def __rsub__(self):
-        raise NotImplementedError
-
-    def __mul__(self):
-        raise NotImplementedError
-
-    def __rmul__(self):
-        raise NotImplementedError
-
-    def __div__(self):
-        raise NotImplementedError
-
-    def __rdiv__(self):
-        raise NotImplementedError
+    @property
+    def widths(self):
+        """The bin widths, computed on first access."""
+        if self._widths is None:
+            self._widths = self.edges[1:] - self.edges[:-1]
+        return self._widths
+
+    @property
+    def midpoints(self):
+        """The bin midpoints, computed on first access."""
+        if self._midpoints is None:
+            self._midpoints = (self.edges[1:] + self.edges[:-1]) / 2
+        return self._midpoints
+
+    @property
+    def int(self):
+        """The integral form of the values."""
+        if self._int is None:
+            self._int = self._diff * self.widths
+        return self._int
+
+    @property
+    def int_error(self):
+        """The integral form of the error."""
+        if self._int_error is None:
+            self._int_error = self._diff_error * self.widths
+        return self._int_error
+
+    @property
+    def diff(self):
+        """The differential form of the values."""
+        if self._diff is None:
+            self._diff = self._int / self.widths
+        return self._diff
+
+    @property
+    def diff_error(self):
+        """The differential form of the error."""
+        if self._diff_error is None:
+            self._diff_error = self._int_error / self.widths
+        return self._diff_error
+
+    # let numpy arrays defer to the reflected operators
+    __array_ufunc__ = None
+
+    def operate(self, other, operator, reflected=False):
+        """Applies an arithmetic operator between the integral form of this
+        spectrum and another spectrum with the same edges, a scalar, or an
+        array of values, propagating the errors to first order."""
+
+        # pull the values and errors out of the other operand
+        if isinstance(other, Spectrum):
+            message = "Spectra must have the same bin edges."
+            assert other.edges is self.edges or np.array_equal(other.edges, self.edges), message
+            b, b_error = other.int, other.int_error
+
+        # scalars and arrays are taken to be exact
+        else:
+            b, b_error = np.asarray(other), 0
+            message = "Arrays must have the same shape as the values."
+            assert b.shape in ((), self.int.shape), message
+
+        # the order matters for reflected operators
+        a, a_error = self.int, self.int_error
+        if reflected:
+            a, a_error, b, b_error = b, b_error, a, a_error
+
+        # compute the new values and errors
+        values, error = propagate(operator, a, a_error, b, b_error)
+
+        return Spectrum(self.edges, values, error, form='int', validate=False)
+
+    def __add__(self, other):
+        return self.operate(other, 'add')
+
+    def __radd__(self, other):
+        return self.operate(other, 'add', reflected=True)
+
+    def __sub__(self, other):
+        return self.operate(other, 'sub')
+
+    def __rsub__(self, other):
+        return self.operate(other, 'sub', reflected=True)
+
+    def __mul__(self, other):
+        return self.operate(other, 'mul')
+
+    def __rmul__(self, other):
+        return self.operate(other, 'mul', reflected=True)
+
+    def __truediv__(self, other):
+        return self.operate(other, 'div')
+
+    def __rtruediv__(self, other):
+        return self.operate(other, 'div', reflected=True)
+
+    __div__, __rdiv__ = __truediv__, __rtruediv__
 
     def plot(self, plot_type, form):
         """This function will return the arguments necessary for plotting
@@ -109,19 +259,21 @@ class Spectrum(object):
         # step looking data on a plt.plot
         if plot_type == 'plot':
 
-            # create doubles of bin edges
-            X = np.array([[xx, xx] for xx in np.array(self.edges)]).flatten()[1:-1]
+            # the steps are cached for each form
+            if self._steps is None:
+                self._steps = {}
 
             # plotting the integral form
             if form in ('int', 'integral'):
-                Y = np.array([[yy, yy] for yy in np.array(self.int)]).flatten()
+                if 'int' not in self._steps:
+                    self._steps['int'] = step_coordinates(self.edges, self.int)
+                return self._steps['int']
 
             # plotting the differential form
             elif form in ('dif', 'diff', 'differential'):
-                Y = np.array([[yy, yy] for yy in np.array(self.diff)]).flatten()
-
-            # return the x and y points
-            return X, Y
+                if 'diff' not in self._steps:
+                    self._steps['diff'] = step_coordinates(self.edges, self.diff)
+                return self._steps['diff']
 
         # for errorbars in the appropriate locations
         elif plot_type == 'errorbar':
@@ -135,53 +287,214 @@ class Spectrum(object):
                 return self.midpoints, self.diff, self.diff_error
 
 
-class Spectrum2D(object):
+class SpectrumStack(object):
 
-    """A useful container for nuclear engineering applications.
-    This description will be updated in the future."""
+    """A stack of named spectra that share bin edges, held as a single array
+    of integral values and a single array of errors with one row per
+    spectrum."""
 
-    def __init__(self, xedges, yedges, values, error, form='int', floor=(0, 0)):
-        """Create a 2D verion of the spectrum object and its associated values.
-        Also calculates some useful things."""
+    def __init__(self, edges, names, values, error):
+        """Create a stack from the shared edges, the names of the spectra and
+        their integral values and errors, one row per name. The arrays are
+        used as is, not copied."""
+
+        # store the edges, shared by every spectrum
+        self.edges = np.asarray(edges)
+
+        # store the names and the row of each
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+        # store values and error in integral form
+        self.int = np.asarray(values)
+        self.int_error = np.asarray(error)
+
+        # check shapes
+        message = "Values and error must have one row per name and one column per bin."
+        assert self.int.shape == self.int_error.shape == (len(self.names), len(self.edges) - 1), message
+
+        return
+
+    @classmethod
+    def from_spectra(cls, spectra):
+        """Stacks a dict of spectra that share bin edges."""
+
+        # all of the spectra must share the edges of the first
+        names = list(spectra.keys())
+        edges = spectra[names[0]].edges
+        message = "Spectra must have the same bin edges."
+        assert all(np.array_equal(spectra[name].edges, edges) for name in names), message
+
+        # stack the values and errors
+        values = np.array([spectra[name].int for name in names])
+        error = np.array([spectra[name].int_error for name in names])
+
+        return cls(edges, names, values, error)
+
+    @property
+    def widths(self):
+        """The bin widths."""
+        return self.edges[1:] - self.edges[:-1]
+
+    @property
+    def diff(self):
+        """The differential form of the values."""
+        return self.int / self.widths
+
+    @property
+    def diff_error(self):
+        """The differential form of the error."""
+        return self.int_error / self.widths
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __getitem__(self, name):
+        """Returns a single spectrum of the stack, viewing its row."""
+        i = self.index[name]
+        return Spectrum(self.edges, self.int[i], self.int_error[i], validate=False)
+
+    def keys(self):
+        return list(self.names)
+
+    def items(self):
+        return [(name, self[name]) for name in self.names]
+
+    def rows(self, indices):
+        """Returns the rows at the indices as a slice when they are
+        contiguous, so that indexing with it gives views, and as an array of
+        indices otherwise."""
+
+        # contiguous rows can be sliced
+        indices = np.asarray(indices, dtype=int)
+        if len(indices) and np.array_equal(indices, np.arange(indices[0], indices[0] + len(indices))):
+            return slice(indices[0], indices[0] + len(indices))
+
+        return indices
+
+    def take(self, indices):
+        """Returns a new stack of the spectra at the indices, which holds
+        views of this one when the rows are contiguous."""
+
+        rows = self.rows(indices)
+
+        return SpectrumStack(self.edges, [self.names[i] for i in np.atleast_1d(indices)],
+                             self.int[rows], self.int_error[rows])
+
+    def select(self, prefix=None, mask=None):
+        """Returns a new stack of the spectra whose names start with a prefix,
+        or of those flagged by a boolean mask."""
+
+        # find the flagged rows
+        if prefix is not None:
+            mask = [name.startswith(prefix) for name in self.names]
+
+        return self.take(np.flatnonzero(mask))
+
+    def fold(self, flux):
+        """Folds every spectrum with a flux, given as a spectrum or an array
+        of integral values, returning the folded values and their errors."""
+
+        # pull out the flux values and errors
+        if isinstance(flux, Spectrum):
+            f, f_error = flux.int, flux.int_error
+        else:
+            f, f_error = np.asarray(flux), np.zeros(len(flux))
+
+        # fold, adding the errors of both in quadrature
+        values = np.dot(self.int, f)
+        error = np.sqrt(np.dot(self.int_error**2, f**2) + np.dot(self.int**2, f_error**2))
+
+        return values, error
 
-        # check array inputs
-        assert type(xedges) in (list, tuple, np.ndarray), "Bin edges must be of type list, tuple, or ndarray."
-        assert type(yedges) in (list, tuple, np.ndarray), "Bin edges must be of type list, tuple, or ndarray."
-        assert type(values) in (list, tuple, np.ndarray), "Values must be of type list, tuple, or ndarray."
-        assert type(error) in (int, list, tuple, np.ndarray), "Error must be of type int, list, tuple, or ndarray."
-        assert type(floor) in (list, list, tuple, np.ndarray), "Floor must be either int or float."
+    def collapse(self, edge_indices):
+        """Collapses every spectrum onto the coarse groups bounded by the
+        fine edges at edge_indices, in a single matrix product."""
 
-        # check spectrum form
+        # collapse every spectrum at once, errors are root sum squared
+        operator = collapse_operator(self.widths, edge_indices)
+        values = np.dot(self.int, operator.T)
+        error = np.sqrt(np.dot(self.int_error**2, (operator**2).T))
+
+        # the new edges are the fine edges at the indices
+        return SpectrumStack(self.edges[edge_indices], self.names, values, error)
+
+    def plot(self, form):
+        """Returns the x points and the stacked y points that plot every
+        spectrum as steps, as plt.plot(X, Y.T)."""
+
+        # check inputs
         message = "Spectrum form option must be literal in ('int', 'integral', 'dif', 'diff', 'differential')."
         assert form in ('int', 'integral', 'dif', 'diff', 'differential'), message
 
-        # allow error to be input as 0, which implies that all error is zero
-        if type(error) is int:
-            assert error is 0, "Error integer input only allows 0."
+        # plotting the integral form
+        if form in ('int', 'integral'):
+            return step_coordinates(self.edges, self.int)
 
-            # then rewrite error
-            error = np.zeros((len(values), len(values[0])))
+        # plotting the differential form
+        elif form in ('dif', 'diff', 'differential'):
+            return step_coordinates(self.edges, self.diff)
 
-        # check
-        if type(values) in (list, tuple):
-            message = "Issue with shape of values."
-            assert all([len(values[i]) == len(values[i + 1]) for i in range(len(values) - 1)]), message
 
-        # check val and err shapes
-        message = "Values and error must have same shape."
-        assert len(values) == len(error), message
-        assert len(values[0]) == len(error[0]), message
+class Spectrum2D(object):
+
+    """A useful container for nuclear engineering applications.
+    This description will be updated in the future."""
 
-        # check edges and val shapes
-        message = "Inconsistency in number of x edges/values."
-        assert len(xedges) in (len(values), len(values) + 1), message
-        message = "Inconsistency in number of y edges/values."
-        assert len(yedges) in (len(values[0]), len(values[0]) + 1), message
+    def __init__(self, xedges, yedges, values, error, form='int', floor=(0, 0), validate=True):
+        """Create a 2D verion of the spectrum object and its associated values.
+        Also calculates some useful things. Trusted callers that already
+        guarantee consistent inputs can skip the checks with validate=False."""
+
+        # check the inputs
+        if validate:
+
+            # check array inputs
+            assert isinstance(xedges, (list, tuple, np.ndarray)), "Bin edges must be of type list, tuple, or ndarray."
+            assert isinstance(yedges, (list, tuple, np.ndarray)), "Bin edges must be of type list, tuple, or ndarray."
+            assert isinstance(values, (list, tuple, np.ndarray)), "Values must be of type list, tuple, or ndarray."
+            assert isinstance(error, (int, list, tuple, np.ndarray)), "Error must be of type int, list, tuple, or ndarray."
+            assert isinstance(floor, (list, tuple, np.ndarray)), "Floor must be either int or float."
+
+            # check spectrum form
+            message = "Spectrum form option must be literal in ('int', 'integral', 'dif', 'diff', 'differential')."
+            assert form in ('int', 'integral', 'dif', 'diff', 'differential'), message
+
+            # allow error to be input as 0, which implies that all error is zero
+            if isinstance(error, int):
+                assert error == 0, "Error integer input only allows 0."
+
+            # check
+            if isinstance(values, (list, tuple)):
+                message = "Issue with shape of values."
+                assert len(set(len(row) for row in values)) <= 1, message
+
+            # check val and err shapes
+            if not isinstance(error, int):
+                message = "Values and error must have same shape."
+                assert len(values) == len(error), message
+                assert len(values[0]) == len(error[0]), message
+
+            # check edges and val shapes
+            message = "Inconsistency in number of x edges/values."
+            assert len(xedges) in (len(values), len(values) + 1), message
+            message = "Inconsistency in number of y edges/values."
+            assert len(yedges) in (len(values[0]), len(values[0]) + 1), message
+
+            # guarantee that bin edges are unique and increasing or decreasing
+            message = "Bin edge values must be unique and strictly increasing or decreasing."
+            assert strictly_monotonic(xedges), message
+            assert strictly_monotonic(yedges), message
 
-        # guarantee that bin edges are unique and increasing or decreasing
-        message = "Bin edge values must be unique and strictly increasing or decreasing."
-        assert all(x < y for x, y in zip(xedges, xedges[1:])) or all(x > y for x, y in zip(xedges, xedges[1:])), message
-        assert all(x < y for x, y in zip(yedges, yedges[1:])) or all(x > y for x, y in zip(yedges, yedges[1:])), message
+        # allow error to be input as 0, which implies that all error is zero
+        if isinstance(error, int):
+            error = np.zeros((len(values), len(values[0])))
 
         # convert all data types to numpy arrays
         values = np.array(values)
@@ -228,29 +541,61 @@ class Spectrum2D(object):
 
         return
 
-    def __add__(self):
-        raise NotImplementedError
+    # let numpy arrays defer to the reflected operators
+    __array_ufunc__ = None
 
-    def __radd__(self):
-        raise NotImplementedError
+    def operate(self, other, operator, reflected=False):
+        """Applies an arithmetic operator between the integral form of this
+        spectrum and another spectrum with the same edges, a scalar, or an
+        array of values, propagating the errors to first order."""
 
-    def __sub__(self):
-        raise NotImplementedError
+        # pull the values and errors out of the other operand
+        if isinstance(other, Spectrum2D):
+            message = "Spectra must have the same bin edges."
+            assert np.array_equal(other.xedges, self.xedges) and np.array_equal(other.yedges, self.yedges), message
+            b, b_error = np.asarray(other.int), np.asarray(other.int_error)
 
-    def __rsub__(self):
-        raise NotImplementedError
+        # scalars and arrays are taken to be exact
+        else:
+            b, b_error = np.asarray(other), 0
+            message = "Arrays must have the same shape as the values."
+            assert b.shape in ((), np.shape(self.int)), message
 
-    def __mul__(self):
-        raise NotImplementedError
+        # the order matters for reflected operators
+        a, a_error = np.asarray(self.int), np.asarray(self.int_error)
+        if reflected:
+            a, a_error, b, b_error = b, b_error, a, a_error
 
-    def __rmul__(self):
-        raise NotImplementedError
+        # compute the new values and errors
+        values, error = propagate(operator, a, a_error, b, b_error)
 
-    def __div__(self):
-        raise NotImplementedError
+        return Spectrum2D(self.xedges, self.yedges, values, error, form='int', validate=False)
 
-    def __rdiv__(self):
-        raise NotImplementedError
+    def __add__(self, other):
+        return self.operate(other, 'add')
+
+    def __radd__(self, other):
+        return self.operate(other, 'add', reflected=True)
+
+    def __sub__(self, other):
+        return self.operate(other, 'sub')
+
+    def __rsub__(self, other):
+        return self.operate(other, 'sub', reflected=True)
+
+    def __mul__(self, other):
+        return self.operate(other, 'mul')
+
+    def __rmul__(self, other):
+        return self.operate(other, 'mul', reflected=True)
+
+    def __truediv__(self, other):
+        return self.operate(other, 'div')
+
+    def __rtruediv__(self, other):
+        return self.operate(other, 'div', reflected=True)
+
+    __div__, __rdiv__ = __truediv__, __rtruediv__
 
     def plot(self, plot_type, form):
         """This will return arguments needed for some 3D plotting."""
@@ -0,0 +1,43 @@
+import io
+import numpy as np
+from parse_cache import cached_parse
+
+# the separators in a strip chart line, all of which become commas, so
+# 'm/d/yyyy,h:m:s ;01, v,0;02, v,0;...' reads as a single row of numbers
+separators = bytes.maketrans(b'/:;', b',,,')
+
+
+def parse_strip_chart(filename):
+    """Reads a reactor strip chart log in one vectorized pass into an array
+    whose first column is the time in seconds from the start of the month and
+    whose other columns are the logged channels. Dropouts, where the logger
+    wrote zeros, are filled forward with the last nonzero value."""
+
+    # read the whole file and split every field with commas
+    with open(filename, 'rb') as F:
+        text = F.read().translate(separators)
+
+    # the day, hour, minute and second columns followed by the channel values,
+    # which follow each channel number and precede its status flag
+    num_channels = (text[:text.find(b'\n')].count(b',') - 6) // 3
+    columns = [1, 3, 4, 5] + [7 + 3 * i for i in range(num_channels)]
+    table = np.loadtxt(io.StringIO(text.decode()), delimiter=',', usecols=columns, ndmin=2)
+
+    # convert the date and time to seconds
+    data = np.empty((len(table), num_channels + 1))
+    data[:, 0] = np.dot(table[:, :4], [86400, 3600, 60, 1])
+    data[:, 1:] = table[:, 4:]
+
+    # point each zero at the last nonzero value before it
+    for values in data[:, 1:].T:
+        last = np.maximum.accumulate(np.where(values != 0, np.arange(len(values)), 0))
+        values[:] = values[last]
+
+    return {'data': data}
+
+
+def read_strip_chart(filename):
+    """Returns the columns of a strip chart log, parsing it only the first
+    time it is read and loading the binary cache after that."""
+
+    return cached_parse(filename, parse_strip_chart)['data']
@@ -0,0 +1,56 @@
+import numpy as np
+from activation import phi, activation
+
+
+def test_phi():
+    """Compares the series and the closed forms where they meet."""
+
+    # load test values on either side of the switch
+    x = np.array([1E-3 * (1 - 1E-9), 1E-3])
+    phi1, phi2 = phi(x)
+
+    assert np.allclose(phi1[0], phi1[1], rtol=1E-12, atol=0)
+    assert np.allclose(phi2[0], phi2[1], rtol=1E-12, atol=0)
+
+    return
+
+
+def test_constant_source():
+    """A constant source from 0 to T, during and after the irradiation."""
+
+    # load test values
+    S, lam, T = 3.0, 0.02, 100.0
+    t = np.array([10, 50, 100, 150, 400])
+
+    # the closed form, growing towards saturation then decaying
+    N = S / lam * -np.expm1(-lam * np.minimum(t, T)) * np.exp(-lam * np.maximum(t - T, 0))
+
+    assert np.allclose(activation(np.array([0, T]), np.array([S, S]), lam, t), N, rtol=1E-14, atol=0)
+
+    return
+
+
+def test_linear_source():
+    """A source ramping linearly up from zero, during and after the ramp,
+    for a decay constant small enough to use the series."""
+
+    for lam in (0.05, 1E-7):
+
+        # load test values
+        a, T = 2.0, 60.0
+        t = np.array([5, 30, 60, 90])
+
+        # the closed form of N' = a t - lam N, with N(0) = 0, up to T, which
+        # is expanded for the small decay constant, where it cancels
+        def ramp(t):
+            if lam * t < 1E-3:
+                return a * t ** 2 * (1 / 2 - lam * t / 6 + (lam * t) ** 2 / 24)
+            return a * (lam * t - 1 + np.exp(-lam * t)) / lam ** 2
+
+        N = np.array([ramp(i) if i <= T else ramp(T) * np.exp(-lam * (i - T)) for i in t])
+
+        # split the ramp into a few segments as well
+        times = np.array([0, 20, 45, T])
+        assert np.allclose(activation(times, a * times, lam, t), N, rtol=1E-12, atol=0)
+
+    return
@@ -0,0 +1,93 @@
+import numpy as np
+import parse_cache
+from genie import parse_report, parse_cnf, read_campaign, cnf_acquisition, cnf_channels, cnf_epoch
+
+
+def test_parse_report(tmp_path):
+    """Parses a mock report with a repeated header."""
+
+    # the text of the report, which repeats its header like genie does
+    header = (b'Acquisition Started             : 4/13/2019  12:26:51 PM\n\n'
+              b'Live Time                       :   248422.4 seconds\n'
+              b'Real Time                       :   248854.7 seconds\n')
+    report = (header + header +
+              b'       Au-196     0.912      9.112353E-005   9.602593E-005\n'
+              b'       AU-198     1.000      4.010098E-002   2.019202E-003\n')
+
+    # write it to a file
+    filename = tmp_path / 'mock.RPT'
+    filename.write_bytes(report)
+    parsed = parse_report(str(filename))
+
+    # 12 PM is noon
+    assert parsed['start'] == np.datetime64('2019-04-13T12:26:51')
+    assert np.allclose(parsed['times'], [248422.4, 248854.7])
+
+    # every nuclide is read, with uppercase names
+    assert list(parsed['nuclides']) == ['AU-196', 'AU-198']
+    assert np.allclose(parsed['activities'][1], [4.010098E-2, 2.019202E-3])
+
+    return
+
+
+def test_parse_cnf(tmp_path):
+    """Parses a mock spectrum with an acquisition and a channel section."""
+
+    # the layout of the file
+    data = bytearray(0x1000)
+    acquisition, channels = 0x200, 0x800
+    counts = np.arange(16, dtype='<u4')
+
+    # the table of section headers
+    for header, (section_id, offset, size) in zip((0x70, 0xa0), ((cnf_acquisition, acquisition, 0x200),
+                                                                 (cnf_channels, channels, 0x200 + 4 * len(counts)))):
+        data[header:header + 4] = section_id.to_bytes(4, 'little')
+        data[header + 6:header + 8] = size.to_bytes(2, 'little')
+        data[header + 10:header + 14] = offset.to_bytes(4, 'little')
+
+    # the acquisition parameters, with live and real times of 600 s and 602.5 s
+    parameters = acquisition + 0x30 + 0x10
+    data[acquisition + 0x24:acquisition + 0x26] = (0x10).to_bytes(2, 'little')
+    data[parameters + 0x01:parameters + 0x09] = ((1554469724 + cnf_epoch) * 10 ** 7).to_bytes(8, 'little')
+    data[parameters + 0x09:parameters + 0x11] = (-6025 * 10 ** 6).to_bytes(8, 'little', signed=True)
+    data[parameters + 0x11:parameters + 0x19] = (-6000 * 10 ** 6).to_bytes(8, 'little', signed=True)
+
+    # the channel data
+    data[channels + 0x200:channels + 0x200 + 4 * len(counts)] = counts.tobytes()
+
+    # write it to a file
+    filename = tmp_path / 'mock.CNF'
+    filename.write_bytes(bytes(data))
+    parsed = parse_cnf(str(filename))
+
+    assert np.array_equal(parsed['counts'], counts)
+    assert np.allclose(parsed['times'], [600, 602.5])
+    assert parsed['start'] == np.datetime64('2019-04-05T13:08:44')
+
+    return
+
+
+def test_read_campaign(tmp_path, monkeypatch):
+    """Reads a directory of reports, one of which lacks the nuclide."""
+
+    # keep the cache out of the repo
+    monkeypatch.setattr(parse_cache, 'cache_path', str(tmp_path / 'cache'))
+
+    # the text of each report
+    header = (b'Acquisition Started             : 4/5/2019    1:08:44 PM\n'
+              b'Live Time                       :      600.0 seconds\n'
+              b'Real Time                       :      602.6 seconds\n')
+    (tmp_path / 'au2.RPT').write_bytes(header + b'       AU-198     1.000      4.010098E-002   2.019202E-003\n')
+    (tmp_path / 'bg.RPT').write_bytes(header + b'       CO-60      0.993      1.698430E-006   8.794780E-007\n')
+
+    records = read_campaign(str(tmp_path), 'Au-198')
+
+    # the records are sorted by name
+    assert list(records['name']) == ['au2', 'bg']
+    assert np.allclose(records['activity'][0], 4.010098E-2)
+    assert np.allclose(records['live'], 600)
+
+    # the report without the nuclide is nan
+    assert np.isnan(records['activity'][1]) and np.isnan(records['activity_error'][1])
+
+    return
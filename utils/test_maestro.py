@@ -0,0 +1,25 @@
+import numpy as np
+from maestro import parse_spe
+
+
+def test_parse_spe(tmp_path):
+    """Parses a mock spectrum, with the sections found by their headers."""
+
+    # the text of the spectrum, with windows line endings like maestro writes
+    spectrum = (b'$SPEC_ID:\r\nNo sample description was entered.\r\n'
+                b'$DATE_MEA:\r\n04/18/2019 15:17:37\r\n'
+                b'$MEAS_TIM:\r\n300 311\r\n'
+                b'$DATA:\r\n0 4\r\n       0\r\n      12\r\n  104315\r\n       7\r\n       1\r\n'
+                b'$ROI:\r\n0\r\n')
+
+    # write it to a file
+    filename = tmp_path / 'mock.Spe'
+    filename.write_bytes(spectrum)
+
+    parsed = parse_spe(str(filename))
+
+    assert np.array_equal(parsed['counts'], [0, 12, 104315, 7, 1])
+    assert np.allclose(parsed['times'], [300, 311])
+    assert parsed['start'] == np.datetime64('2019-04-18T15:17:37')
+
+    return
@@ -0,0 +1,63 @@
+import numpy as np
+import mcnp_output
+from mcnp_output import open_output, tally_sections, tally_number, read_table, read_rows, tally_pattern
+
+
+def mock_output(directory):
+    """Produces a small mock mcnp output with two tallies in a directory."""
+
+    # the text of the output file
+    output = (b'problem summary\n'
+              b'1tally      114        nps = 1000\n'
+              b'                 1.00000E+00 0.0100\n'
+              b'                 2.00000E+00 0.0200\n'
+              b'1tally      124        nps = 1000\n'
+              b'                 3.00000E+00 0.0300\n')
+
+    # write it to a file
+    filename = directory / 'mock.out'
+    filename.write_bytes(output)
+
+    return str(filename)
+
+
+def test_read_rows(tmp_path):
+    """Reads the rows of each tally section in the mock output."""
+
+    # load test values
+    filename = mock_output(tmp_path)
+
+    with open_output(filename) as mm:
+
+        # there should be a section for each tally
+        sections = tally_sections(mm)
+        assert len(sections) == 2
+        assert tally_number(mm, sections[1][0]) == 124
+
+        # read all of the rows
+        rows = read_table(mm, tally_pattern)
+        assert np.allclose(rows, [[1, 0.01], [2, 0.02], [3, 0.03]])
+
+        # read only the first section, into a larger array
+        rows = np.zeros((4, 2))
+        assert read_rows(mm, tally_pattern, rows, *sections[0], skip=1) == 1
+        assert np.allclose(rows[0], [2, 0.02])
+
+    return
+
+
+def test_read_chunks(tmp_path, monkeypatch):
+    """Reads the mock output a couple of matches at a time."""
+
+    # load test values
+    filename = mock_output(tmp_path)
+
+    # convert fewer matches at once than there are rows
+    monkeypatch.setattr(mcnp_output, 'chunk_size', 2)
+
+    with open_output(filename) as mm:
+        rows = read_table(mm, tally_pattern)
+
+    assert np.allclose(rows, [[1, 0.01], [2, 0.02], [3, 0.03]])
+
+    return
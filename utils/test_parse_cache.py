@@ -0,0 +1,62 @@
+import os
+import numpy as np
+import pytest
+import parse_cache
+from parse_cache import cache_file, cached_parse, mapped_parse, write_cache
+
+
+def parse_mock(filename):
+    """Reads the numbers in a mock file."""
+    return {'values': np.loadtxt(filename, ndmin=1)}
+
+
+def parse_other(filename):
+    """Reads the numbers in a mock file, as another parser."""
+    return {'values': np.loadtxt(filename, ndmin=1)}
+
+
+def interrupted_save(F, data):
+    """Writes part of a file and then fails, like an interrupted save."""
+    F.write(b'PK')
+    raise KeyboardInterrupt
+
+
+def test_cached_parse(tmp_path, monkeypatch):
+    """Parses a mock file once, then loads it from the cache."""
+
+    # keep the cache out of the repo
+    monkeypatch.setattr(parse_cache, 'cache_path', str(tmp_path / 'cache'))
+
+    # load test values
+    filename = tmp_path / 'values.txt'
+    filename.write_text('1 2 3')
+
+    # the first parse fills the cache, with nothing else left in it
+    assert np.array_equal(cached_parse(str(filename), parse_mock)['values'], [1, 2, 3])
+    assert os.listdir(tmp_path / 'cache') == [os.path.basename(cache_file(str(filename), parse_mock))]
+
+    # the mapped cache is separate and read only
+    values = mapped_parse(str(filename), parse_mock)['values']
+    assert np.array_equal(values, [1, 2, 3]) and not values.flags.writeable
+
+    # different parsers and versions key different caches
+    assert cache_file(str(filename), parse_mock) != cache_file(str(filename), parse_other)
+    monkeypatch.setattr(parse_cache, 'cache_version', parse_cache.cache_version + 1)
+    assert not os.path.exists(cache_file(str(filename), parse_mock))
+
+    return
+
+
+def test_write_cache(tmp_path, monkeypatch):
+    """An interrupted write leaves neither the cache file nor a partial one."""
+
+    # keep the cache out of the repo
+    monkeypatch.setattr(parse_cache, 'cache_path', str(tmp_path / 'cache'))
+    cached = str(tmp_path / 'cache' / 'values.npz')
+
+    with pytest.raises(KeyboardInterrupt):
+        write_cache(cached, interrupted_save, None)
+
+    assert os.listdir(tmp_path / 'cache') == []
+
+    return
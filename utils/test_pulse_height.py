@@ -0,0 +1,50 @@
+import numpy as np
+from pulse_height import model, jacobian, fit_spectra, dead_time, count_rates
+
+
+def test_jacobian():
+    """Compares the analytic jacobian to central differences."""
+
+    # load test values
+    x = np.linspace(0, 50, 11)
+    p = np.array([2, 0.1, 30, -3, 20])
+    h = 1E-6
+
+    # difference the model in each parameter
+    step = h * np.eye(len(p))
+    numeric = np.column_stack([(model(x, *(p + s)) - model(x, *(p - s))) / (2 * h) for s in step])
+
+    assert np.allclose(jacobian(x, *p), numeric, atol=1E-8)
+
+    return
+
+
+def test_fit_spectra():
+    """Recovers the peak areas of noiseless spectra of different lengths."""
+
+    # load test values
+    spectra = [model(np.arange(n), 50, 0.05, area, 8, 60) for n, area in ((120, 400), (150, 900))]
+
+    fits = fit_spectra(spectra, p0=[40, 0.04, 500, 10, 55])
+
+    assert np.allclose(fits[:, 2], [400, 900])
+
+    return
+
+
+def test_count_rates():
+    """Corrects a stack of spectra for dead time with and without a model."""
+
+    # load test values, where the second detector was live half the time
+    spectra = np.array([[10, 20, 70], [50, 100, 350]])
+    live, real = np.array([100, 100]), np.array([100, 200])
+
+    # the clocks imply no dead time in the first and 1/5 s per count in the
+    # second, and they alone reduce to dividing by live time
+    assert np.allclose(dead_time(spectra, live, real), [0, 0.2])
+    assert np.allclose(count_rates(spectra, live, real), spectra / live[:, np.newaxis])
+
+    # the model with the dead time of the second detector agrees with it
+    assert np.allclose(count_rates(spectra[1], live[1], real[1], tau=0.2), spectra[1] / 100)
+
+    return
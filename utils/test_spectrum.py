@@ -1,2 +1,118 @@
-from spectrum import Spectrum
+import numpy as np
+from spectrum import Spectrum, SpectrumStack, step_coordinates
 
+
+def test_forms():
+    """Checks that the integral and differential forms are consistent and
+    that the edges are shared, not copied."""
+
+    # produce a simple spectrum in each form
+    edges = np.array([0.0, 1.0, 3.0, 6.0])
+    int_spectrum = Spectrum(edges, [2, 4, 6], [1, 1, 1], form='int')
+    diff_spectrum = Spectrum(edges, [2, 2, 2], [1, 0.5, 1 / 3], form='diff')
+
+    # the derived forms should match
+    assert np.allclose(int_spectrum.diff, diff_spectrum.diff)
+    assert np.allclose(diff_spectrum.int, int_spectrum.int)
+    assert np.allclose(int_spectrum.diff_error, diff_spectrum.diff_error)
+    assert np.allclose(int_spectrum.midpoints, [0.5, 2, 4.5])
+
+    # both use the same edges array
+    assert int_spectrum.edges is edges
+    assert diff_spectrum.edges is edges
+
+    return
+
+
+def test_validation():
+    """Checks that inconsistent inputs are caught unless validation is
+    skipped."""
+
+    # edges that aren't monotonic
+    edges = [0, 2, 1, 3]
+
+    # these should be caught
+    try:
+        Spectrum(edges, [1, 2, 3], 0)
+        raise RuntimeError('Non-monotonic edges were not caught.')
+    except AssertionError:
+        pass
+
+    # but are not checked by the fast path
+    Spectrum(edges, [1, 2, 3], 0, validate=False)
+
+    return
+
+
+def test_steps():
+    """Checks the step plot coordinates of a single and a stacked spectrum."""
+
+    # produce a simple spectrum
+    edges = np.array([0.0, 1.0, 3.0])
+    spectrum = Spectrum(edges, [2, 4], 0)
+
+    # check the steps of the integral form
+    X, Y = spectrum.plot('plot', 'int')
+    assert np.allclose(X, [0, 1, 1, 3])
+    assert np.allclose(Y, [2, 2, 4, 4])
+
+    # a stack of spectra shares the x points
+    X, Y = step_coordinates(edges, np.array([[2, 4], [1, 2]]))
+    assert np.allclose(X, [0, 1, 1, 3])
+    assert np.allclose(Y, [[2, 2, 4, 4], [1, 1, 2, 2]])
+
+    return
+
+
+def test_arithmetic():
+    """Checks the arithmetic between spectra, scalars and arrays, along with
+    the error propagation."""
+
+    # produce two spectra on the same edges
+    edges = np.array([0.0, 1.0, 3.0])
+    a = Spectrum(edges, [2.0, 4.0], [0.3, 0.4])
+    b = Spectrum(edges, [1.0, 2.0], [0.4, 0.3])
+
+    # sums and differences
+    assert np.allclose((a + b).int, [3, 6])
+    assert np.allclose((a - b).int_error, [0.5, 0.5])
+    assert np.allclose((1 - a).int, [-1, -3])
+
+    # products and quotients
+    assert np.allclose((a * b).int, [2, 8])
+    assert np.allclose((a * b).int_error, np.hypot([0.3, 0.8], [0.8, 1.2]))
+    assert np.allclose((a / b).int, [2, 2])
+    assert np.allclose((4 / b).int, [4, 2])
+
+    # scalars and arrays scale the errors
+    assert np.allclose((2 * a).int_error, [0.6, 0.8])
+    assert np.allclose((np.array([1.0, 2.0]) * a).int, [2, 8])
+
+    return
+
+
+def test_stack():
+    """Checks selection, folding and collapsing of a stack of spectra."""
+
+    # produce a small stack
+    edges = np.array([0.0, 1.0, 3.0, 6.0])
+    values = np.array([[1.0, 2.0, 3.0], [2.0, 2.0, 2.0], [0.0, 1.0, 0.0]])
+    stack = SpectrumStack(edges, ['au0', 'au1', 'bs0'], values, values * 0.1)
+
+    # prefix selection of contiguous rows gives views
+    gold = stack.select(prefix='au')
+    assert gold.names == ['au0', 'au1']
+    assert np.shares_memory(gold.int, stack.int)
+    assert np.allclose(stack['bs0'].int, [0, 1, 0])
+
+    # fold with a flux
+    values, error = gold.fold(np.array([1.0, 1.0, 2.0]))
+    assert np.allclose(values, [9, 8])
+    assert np.allclose(error, 0.1 * np.sqrt([1 + 4 + 36, 4 + 4 + 16]))
+
+    # collapse, each coarse bin spans its fine bins through the upper index
+    collapsed = stack.collapse([0, 1, 2])
+    assert np.allclose(collapsed.edges, [0, 1, 3])
+    assert np.allclose(collapsed.int[:, 0], [5 / 3, 2, 2 / 3])
+
+    return
@@ -0,0 +1,25 @@
+import numpy as np
+from strip_chart import parse_strip_chart
+
+
+def test_parse_strip_chart(tmp_path):
+    """Parses a mock strip chart with a dropout in it."""
+
+    # the text of the log, where the logger dropped out on the second line
+    log = (b'4/5/2019,9:00:00 ;01, 36.2,0;02, .0004,0;03, .35,0;\n'
+           b'4/5/2019,9:00:01 ;01, 0,0;02, 0,0;03, 0,0;\n'
+           b'4/5/2019,12:23:29;01, 40.1,0;02, 1.5,0;03, .37,0;\n')
+
+    # write it to a file
+    filename = tmp_path / 'log.txt'
+    filename.write_bytes(log)
+
+    data = parse_strip_chart(str(filename))['data']
+
+    # the times are in seconds from the start of the month
+    assert np.allclose(data[:, 0], 5 * 86400 + np.array([32400, 32401, 44609]))
+
+    # the dropout takes the previous values
+    assert np.allclose(data[:, 1:], [[36.2, 0.0004, 0.35], [36.2, 0.0004, 0.35], [40.1, 1.5, 0.37]])
+
+    return